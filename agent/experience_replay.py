@@ -0,0 +1,159 @@
+import json
+import os
+
+import numpy as np
+
+
+class ExperienceReplay:
+    priority_epsilon: float = 1e-6
+
+    def __init__(self, capacity: int, state_shape: tuple[int, ...] = (), state_dtype: np.dtype = np.int64,
+                 path: str = None, alpha: float = 0.6, seed: int = None) -> None:
+        self.capacity = capacity
+        self.alpha = alpha
+        self.path = path
+        self.rng = np.random.default_rng(seed)
+        self.dtype = np.dtype([
+            ('state', state_dtype, state_shape),
+            ('action', np.int8),
+            ('reward', np.float32),
+            ('next_state', state_dtype, state_shape),
+            ('done', bool),
+            ('priority', np.float32)
+        ])
+        self.size = 0
+        self.position = 0
+        self.max_priority = 1.0
+
+        if path is None:
+            self.transitions = np.zeros(capacity, dtype=self.dtype)
+        elif os.path.exists(path):
+            self.transitions = np.lib.format.open_memmap(path, mode='r+')
+
+            if self.transitions.dtype != self.dtype or self.transitions.shape != (capacity,):
+                raise ValueError(f'{path} holds {self.transitions.shape} {self.transitions.dtype}, '
+                                 f'expected {(capacity,)} {self.dtype}')
+
+            self._load_meta()
+        else:
+            self.transitions = np.lib.format.open_memmap(path, mode='w+', dtype=self.dtype, shape=(capacity,))
+
+        self.leaf_offset = 1 << max(capacity - 1, 1).bit_length()
+        self.tree: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, state, action: int, reward: float, next_state, done: bool) -> None:
+        i = self.position
+        self.transitions[i] = (state, action, reward, next_state, done, self.max_priority)
+
+        if self.tree is not None:
+            node = self.leaf_offset + i
+            self.tree[node] = self.max_priority ** self.alpha
+
+            while node > 1:
+                node //= 2
+                self.tree[node] = self.tree[2 * node] + self.tree[2 * node + 1]
+
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def extend(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray, next_states: np.ndarray,
+               dones: np.ndarray) -> None:
+        count = min(len(actions), self.capacity)
+
+        if count == 0:
+            return
+
+        indices = (self.position + np.arange(count)) % self.capacity
+        transitions = self.transitions
+
+        transitions['state'][indices] = states[-count:]
+        transitions['action'][indices] = actions[-count:]
+        transitions['reward'][indices] = rewards[-count:]
+        transitions['next_state'][indices] = next_states[-count:]
+        transitions['done'][indices] = dones[-count:]
+        transitions['priority'][indices] = self.max_priority
+        self._update_tree(indices, self.max_priority ** self.alpha)
+        self.position = int(indices[-1] + 1) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def sample(self, batch_size: int) -> tuple[np.ndarray, np.ndarray]:
+        self._check_not_empty()
+        indices = self.rng.integers(self.size, size=batch_size)
+        return indices, self.transitions[indices]
+
+    def sample_prioritized(self, batch_size: int, beta: float = 0.4) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        self._check_not_empty()
+
+        if self.tree is None:
+            self._build_tree()
+
+        total = float(self.tree[1])
+        targets = (np.arange(batch_size) + self.rng.random(batch_size)) * (total / batch_size)
+        nodes = np.ones(batch_size, dtype=np.int64)
+
+        while nodes[0] < self.leaf_offset:
+            left = 2 * nodes
+            go_right = targets > self.tree[left]
+            targets -= np.where(go_right, self.tree[left], 0)
+            nodes = left + go_right
+
+        indices = np.minimum(nodes - self.leaf_offset, self.size - 1)
+        probabilities = self.tree[self.leaf_offset + indices] / total
+        weights = (self.size * probabilities) ** -beta
+
+        return indices, self.transitions[indices], (weights / weights.max()).astype(np.float32)
+
+    def update_priorities(self, indices: np.ndarray, errors: np.ndarray) -> None:
+        priorities = np.abs(errors) + self.priority_epsilon
+        self.transitions['priority'][indices] = priorities
+        self._update_tree(indices, priorities ** self.alpha)
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+
+    def flush(self) -> None:
+        if self.path is None:
+            return
+
+        self.transitions.flush()
+
+        with open(self.path + '.json', 'w') as f:
+            json.dump({'size': self.size, 'position': self.position, 'max_priority': self.max_priority}, f)
+
+    def _load_meta(self) -> None:
+        if not os.path.exists(self.path + '.json'):
+            return
+
+        with open(self.path + '.json', 'r') as f:
+            meta = json.load(f)
+
+        self.size = meta['size']
+        self.position = meta['position']
+        self.max_priority = meta['max_priority']
+
+    def _check_not_empty(self) -> None:
+        if self.size == 0:
+            raise ValueError('Cannot sample from an empty ExperienceReplay')
+
+    def _build_tree(self) -> None:
+        self.tree = np.zeros(2 * self.leaf_offset, dtype=np.float32)
+        self.tree[self.leaf_offset:self.leaf_offset + self.size] = \
+            self.transitions['priority'][:self.size] ** np.float32(self.alpha)
+        level = self.leaf_offset // 2
+
+        while level >= 1:
+            self.tree[level:2 * level] = self.tree[2 * level:4 * level:2] + self.tree[2 * level + 1:4 * level:2]
+            level //= 2
+
+    def _update_tree(self, indices: np.ndarray, priorities) -> None:
+        if self.tree is None:
+            return
+
+        nodes = self.leaf_offset + indices
+        self.tree[nodes] = priorities
+        nodes = np.unique(nodes // 2)
+
+        while nodes[0] >= 1:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            nodes = np.unique(nodes // 2)
@@ -0,0 +1,113 @@
+import numpy as np
+
+from pygame import Vector2
+
+from batch_game import BatchGame
+from controller.controller import Controller
+from enums.direction import Direction
+from enums.ghost_state import GhostState
+
+
+class QLearningAgent(Controller):
+    danger_radius: int = 4
+    direction_count: int = len(Direction.ACTIONS) + 1
+    danger_count: int = 2 ** len(Direction.ACTIONS)
+    action_count: int = len(Direction.ACTIONS)
+
+    def __init__(self, map_size: tuple[int, int], learning_rate: float = 0.1, discount: float = 0.99,
+                 epsilon: float = 0.1, seed: int = None, q_table: np.ndarray = None) -> None:
+        self.map_height, self.map_width = map_size
+        self.learning_rate = learning_rate
+        self.discount = discount
+        self.epsilon = epsilon
+        self.rng = np.random.default_rng(seed)
+        self.state_count = self.map_height * self.map_width * self.direction_count * self.danger_count * 2
+
+        if q_table is None:
+            q_table = np.zeros((self.state_count, self.action_count), dtype=np.float32)
+
+        if q_table.shape != (self.state_count, self.action_count):
+            raise ValueError(f'Q-table shape {q_table.shape} does not match {(self.state_count, self.action_count)}')
+
+        self.q_table = q_table
+        self.direction_indices = np.full((3, 3), len(Direction.ACTIONS), dtype=np.int64)
+
+        for i, direction in enumerate(Direction.ACTIONS):
+            self.direction_indices[int(direction.x) + 1, int(direction.y) + 1] = i
+
+    def get_direction(self, game) -> Vector2:
+        return Direction.ACTIONS[self.choose_action(self.encode(game))]
+
+    def encode(self, game) -> int:
+        pacman_tile = game.pacman.get_current_tile_coordinates()
+        x, y = int(pacman_tile.x), int(pacman_tile.y)
+        direction = game.pacman.direction
+        danger = 0
+
+        for ghost in game.ghosts:
+            if ghost.state in [GhostState.FRIGHTENED, GhostState.REVERSE, GhostState.EATEN]:
+                continue
+
+            ghost_tile = ghost.get_current_tile_coordinates()
+            danger |= self._danger_bits(int(ghost_tile.x) - x, int(ghost_tile.y) - y)
+
+        return int(self._key(y * self.map_width + x,
+                             self.direction_indices[int(direction.x) + 1, int(direction.y) + 1], danger,
+                             game.pellet_time_seconds > 0))
+
+    def encode_batch(self, games: BatchGame) -> np.ndarray:
+        x, y = games.get_tile_coordinates(games.pacman_x, games.pacman_y)
+        idle = (games.pacman_dx == 0) & (games.pacman_dy == 0)
+        dx = np.where(idle, games.pacman_queued_dx, games.pacman_dx).astype(np.int64)
+        dy = np.where(idle, games.pacman_queued_dy, games.pacman_dy).astype(np.int64)
+
+        ghost_x, ghost_y = games.get_tile_coordinates(games.ghost_x, games.ghost_y)
+        offset_x = ghost_x - x[:, None]
+        offset_y = ghost_y - y[:, None]
+        state = games.ghost_state
+        dangerous = (state != games.FRIGHTENED) & (state != games.REVERSE) & (state != games.EATEN) \
+            & (np.abs(offset_x) + np.abs(offset_y) <= self.danger_radius)
+        horizontal = np.abs(offset_x) >= np.abs(offset_y)
+        bits = np.where(horizontal, np.where(offset_x < 0, 1, 4), np.where(offset_y < 0, 2, 8))
+        bits = np.where((offset_x == 0) & (offset_y == 0), self.danger_count - 1, bits)
+        danger = np.bitwise_or.reduce(np.where(dangerous, bits, 0), axis=1)
+
+        return self._key(y * self.map_width + x, self.direction_indices[dx + 1, dy + 1], danger,
+                         games.pellet_time_seconds > 0)
+
+    def choose_action(self, state: int) -> int:
+        if self.rng.random() < self.epsilon:
+            return int(self.rng.integers(self.action_count))
+
+        return int(np.argmax(self.q_table[state]))
+
+    def choose_actions(self, states: np.ndarray) -> np.ndarray:
+        actions = np.argmax(self.q_table[states], axis=1)
+        explore = self.rng.random(states.size) < self.epsilon
+        actions[explore] = self.rng.integers(self.action_count, size=int(explore.sum()))
+
+        return actions
+
+    def update(self, state: int, action: int, reward: float, next_state: int, done: bool) -> None:
+        target = reward if done else reward + self.discount * self.q_table[next_state].max()
+        self.q_table[state, action] += self.learning_rate * (target - self.q_table[state, action])
+
+    def update_batch(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray, next_states: np.ndarray,
+                     dones: np.ndarray) -> None:
+        targets = rewards + self.discount * self.q_table[next_states].max(axis=1) * ~dones
+        self.q_table[states, actions] += self.learning_rate * (targets - self.q_table[states, actions])
+
+    def _key(self, tile, direction, danger, frightened):
+        return ((tile * self.direction_count + direction) * self.danger_count + danger) * 2 + frightened
+
+    def _danger_bits(self, offset_x: int, offset_y: int) -> int:
+        if abs(offset_x) + abs(offset_y) > self.danger_radius:
+            return 0
+
+        if offset_x == 0 and offset_y == 0:
+            return self.danger_count - 1
+
+        if abs(offset_x) >= abs(offset_y):
+            return 1 if offset_x < 0 else 4
+
+        return 2 if offset_y < 0 else 8
@@ -0,0 +1,150 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+
+def _get_umask() -> int:
+    try:
+        with open('/proc/self/status', 'r') as f:
+            return next(int(line.split()[1], 8) for line in f if line.startswith('Umask:'))
+    except (OSError, StopIteration, ValueError):
+        umask = os.umask(0)
+        os.umask(umask)
+        return umask
+
+
+class QTableCheckpoint:
+    file_mode: int = 0o666 & ~_get_umask()
+
+    def __init__(self, path: str, interval_seconds: float = 60) -> None:
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.last_save_time = time.perf_counter()
+        self.saves = 0
+        self.error: Exception | None = None
+        self._snapshot: np.ndarray | None = None
+        self._step = 0
+        self._pending = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='q-table-checkpoint', daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def load(path: str, writable: bool = False) -> np.ndarray | None:
+        if not os.path.exists(path):
+            return None
+
+        return np.asarray(np.load(path, mmap_mode='c' if writable else 'r'))
+
+    @staticmethod
+    def load_step(path: str) -> int:
+        try:
+            with open(path + '.json', 'r') as f:
+                return json.load(f)['step']
+        except (OSError, KeyError, ValueError):
+            return 0
+
+    @property
+    def busy(self) -> bool:
+        return not self._idle.is_set()
+
+    def maybe_save(self, q_table: np.ndarray, step: int = 0) -> bool:
+        if time.perf_counter() - self.last_save_time < self.interval_seconds:
+            return False
+
+        return self.save(q_table, step)
+
+    def save(self, q_table: np.ndarray, step: int = 0, block: bool = False) -> bool:
+        if block:
+            self._idle.wait()
+        elif self.busy:
+            return False
+
+        self._raise_error()
+
+        if self._snapshot is None or self._snapshot.shape != q_table.shape or self._snapshot.dtype != q_table.dtype:
+            self._snapshot = np.empty_like(q_table)
+
+        np.copyto(self._snapshot, q_table)
+        self._step = step
+        self.last_save_time = time.perf_counter()
+        self._idle.clear()
+        self._pending.set()
+
+        if block:
+            self._idle.wait()
+            self._raise_error()
+
+        return True
+
+    def wait(self) -> None:
+        self._idle.wait()
+
+    def close(self) -> None:
+        self.wait()
+        self._closed = True
+        self._pending.set()
+        self._thread.join()
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            self._pending.wait()
+            self._pending.clear()
+
+            if self._closed:
+                return
+
+            try:
+                self._write(self._snapshot, self._step)
+                self.saves += 1
+            except Exception as e:
+                self.error = e
+            finally:
+                self._idle.set()
+
+    def _raise_error(self) -> None:
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise RuntimeError(f'Writing checkpoint {self.path} failed') from error
+
+    def _write(self, q_table: np.ndarray, step: int) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._replace(self.path + '.json', lambda temporary_path: self._write_meta(temporary_path, q_table, step))
+        self._replace(self.path, lambda temporary_path: self._write_table(temporary_path, q_table))
+
+    def _replace(self, target: str, write) -> None:
+        descriptor, temporary_path = tempfile.mkstemp(prefix=os.path.basename(target) + '.', suffix='.tmp',
+                                                      dir=os.path.dirname(os.path.abspath(target)))
+        os.close(descriptor)
+
+        try:
+            write(temporary_path)
+            os.chmod(temporary_path, os.stat(target).st_mode & 0o777 if os.path.exists(target) else self.file_mode)
+            os.replace(temporary_path, target)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    @staticmethod
+    def _write_meta(path: str, q_table: np.ndarray, step: int) -> None:
+        with open(path, 'w') as f:
+            json.dump({'step': step, 'shape': list(q_table.shape), 'dtype': q_table.dtype.str}, f)
+
+    @staticmethod
+    def _write_table(path: str, q_table: np.ndarray) -> None:
+        output = np.lib.format.open_memmap(path, mode='w+', dtype=q_table.dtype, shape=q_table.shape)
+        output[:] = q_table
+        output.flush()
@@ -0,0 +1,189 @@
+import multiprocessing
+import queue
+import time
+
+import numpy as np
+
+from multiprocessing.shared_memory import SharedMemory
+
+from agent.q_learning_agent import QLearningAgent
+from agent.q_table_checkpoint import QTableCheckpoint
+from batch_game import BatchGame
+from enums.sync_mode import SyncMode
+
+
+class RolloutStats:
+
+    def __init__(self, steps: int = 0, episodes: int = 0, score_total: int = 0, seconds: float = 0) -> None:
+        self.steps = steps
+        self.episodes = episodes
+        self.score_total = score_total
+        self.seconds = seconds
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.steps / self.seconds if self.seconds > 0 else 0
+
+    @property
+    def mean_score(self) -> float:
+        return self.score_total / self.episodes if self.episodes > 0 else 0
+
+    def __repr__(self) -> str:
+        return (f'RolloutStats(steps={self.steps}, episodes={self.episodes}, mean_score={self.mean_score:.1f}, '
+                f'steps_per_second={self.steps_per_second:.0f})')
+
+
+class RolloutPool:
+
+    def __init__(self, worker_count: int, games_per_worker: int, sync_mode: SyncMode = SyncMode.HOGWILD,
+                 merge_interval: int = 1000, seed: int = None, learning_rate: float = 0.1, discount: float = 0.99,
+                 epsilon: float = 0.1, checkpoint_path: str = None, checkpoint_interval: float = 60) -> None:
+        self.worker_count = worker_count
+        self.games_per_worker = games_per_worker
+        self.sync_mode = sync_mode
+        self.merge_interval = merge_interval
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.agent_options = {'learning_rate': learning_rate, 'discount': discount, 'epsilon': epsilon}
+
+        games = BatchGame(1)
+        self.map_size = (games.map_height, games.map_width)
+        template = QLearningAgent(self.map_size)
+        self.shape = template.q_table.shape
+        self.dtype = template.q_table.dtype
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        warm_start = None if checkpoint_path is None else QTableCheckpoint.load(checkpoint_path)
+
+        if warm_start is not None and warm_start.shape != self.shape:
+            raise ValueError(f'Q-table shape {warm_start.shape} does not match {self.shape}')
+
+        self.step = 0 if warm_start is None else QTableCheckpoint.load_step(checkpoint_path)
+        self.shared_memory = SharedMemory(create=True, size=template.q_table.nbytes)
+        self.q_table = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shared_memory.buf)
+        self.q_table[:] = 0 if warm_start is None else warm_start
+        self.lock = multiprocessing.Lock()
+
+    def run(self, steps: int) -> RolloutStats:
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_run_worker, args=(
+                self.shared_memory.name, self.shape, self.dtype, self.map_size, self.sync_mode, self.merge_interval,
+                self.games_per_worker, steps, seed, self.agent_options, self.lock, results
+            ))
+            for seed in self.seed_sequence.spawn(self.worker_count)
+        ]
+        start_time = time.perf_counter()
+        stats = RolloutStats()
+        checkpoint = None if self.checkpoint_path is None else QTableCheckpoint(self.checkpoint_path,
+                                                                                 self.checkpoint_interval)
+        finished = 0
+
+        try:
+            for worker in workers:
+                worker.start()
+
+            while finished < len(workers):
+                try:
+                    worker_steps, episodes, score_total = results.get(timeout=1)
+                except queue.Empty:
+                    self._check_workers(workers)
+
+                    if checkpoint is not None and not checkpoint.busy:
+                        self._save_checkpoint(checkpoint)
+
+                    continue
+
+                finished += 1
+                stats.steps += worker_steps
+                stats.episodes += episodes
+                stats.score_total += score_total
+
+            for worker in workers:
+                worker.join()
+
+            stats.seconds = time.perf_counter() - start_time
+            self.step += steps
+
+            if checkpoint is not None:
+                self._save_checkpoint(checkpoint, True)
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+
+                if worker.pid is not None:
+                    worker.join()
+
+            results.close()
+
+            if checkpoint is not None:
+                checkpoint.close()
+
+        return stats
+
+    @staticmethod
+    def _check_workers(workers: list[multiprocessing.Process]) -> None:
+        for i, worker in enumerate(workers):
+            if worker.exitcode not in [None, 0]:
+                raise RuntimeError(f'Rollout worker {i} exited with code {worker.exitcode}')
+
+    def _save_checkpoint(self, checkpoint: QTableCheckpoint, force: bool = False) -> None:
+        with self.lock:
+            if force:
+                checkpoint.save(self.q_table, self.step, block=True)
+            else:
+                checkpoint.maybe_save(self.q_table, self.step)
+
+    def close(self) -> None:
+        del self.q_table
+        self.shared_memory.close()
+        self.shared_memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _run_worker(shared_memory_name: str, shape: tuple[int, int], dtype: np.dtype, map_size: tuple[int, int],
+                sync_mode: SyncMode, merge_interval: int, game_count: int, steps: int,
+                seed: np.random.SeedSequence, agent_options: dict, lock, results) -> None:
+    shared_memory = SharedMemory(name=shared_memory_name)
+    shared_q_table = np.ndarray(shape, dtype=dtype, buffer=shared_memory.buf)
+    game_seed, agent_seed = seed.spawn(2)
+    games = BatchGame(game_count, game_seed)
+
+    if sync_mode == SyncMode.HOGWILD:
+        agent = QLearningAgent(map_size, seed=agent_seed, q_table=shared_q_table, **agent_options)
+    else:
+        agent = QLearningAgent(map_size, seed=agent_seed, q_table=shared_q_table.copy(), **agent_options)
+        merged_q_table = agent.q_table.copy()
+
+    scores = np.zeros(game_count, dtype=np.int64)
+    states = agent.encode_batch(games)
+    episodes = 0
+    score_total = 0
+
+    for step in range(1, steps + 1):
+        actions = agent.choose_actions(states)
+        rewards, dones = games.step(actions)
+        next_states = agent.encode_batch(games)
+        agent.update_batch(states, actions, rewards, next_states, dones)
+        states = next_states
+
+        scores += rewards
+        episodes += int(dones.sum())
+        score_total += int(scores[dones].sum())
+        scores[dones] = 0
+
+        if sync_mode == SyncMode.MERGE and (step % merge_interval == 0 or step == steps):
+            with lock:
+                shared_q_table += agent.q_table - merged_q_table
+                agent.q_table[:] = shared_q_table
+
+            merged_q_table[:] = agent.q_table
+
+    del agent, shared_q_table
+    shared_memory.close()
+    results.put((steps * game_count, episodes, score_total))
@@ -0,0 +1,46 @@
+import os
+
+from pygame import SurfaceType
+from pygame.font import Font
+
+from main import load_font, load_image
+from world.tileset import Tileset
+
+
+class AssetRegistry:
+    _images: dict[str, SurfaceType] = {}
+    _fonts: dict[tuple[str, int], Font] = {}
+    _tilesets: dict[str, Tileset] = {}
+
+    @classmethod
+    def get_image(cls, path: str) -> SurfaceType:
+        path = os.path.normpath(path)
+
+        if path not in cls._images:
+            cls._images[path] = load_image(path)
+
+        return cls._images[path]
+
+    @classmethod
+    def get_font(cls, path: str, size: int) -> Font:
+        key = (os.path.normpath(path), size)
+
+        if key not in cls._fonts:
+            cls._fonts[key] = load_font(*key)
+
+        return cls._fonts[key]
+
+    @classmethod
+    def get_tileset(cls, path: str) -> Tileset:
+        path = os.path.normpath(path)
+
+        if path not in cls._tilesets:
+            cls._tilesets[path] = Tileset(path, cls.get_image(path))
+
+        return cls._tilesets[path]
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._images.clear()
+        cls._fonts.clear()
+        cls._tilesets.clear()
@@ -0,0 +1,498 @@
+import numpy as np
+
+from pygame import Vector2
+
+from enums.direction import Direction
+from enums.ghost_state import GhostState
+from enums.walker import Walker
+from game import Game
+from game_snapshot import GameSnapshot
+from main import FPS
+from sprite.entity import Entity
+from sprite.ghost import Ghost
+from sprite.pacman import Pacman
+from world.tile import Tile
+
+
+class BatchGame:
+    HOME, CHASE, EATEN, REVERSE, FRIGHTENED = range(5)
+    ghost_states: list[GhostState] = [GhostState.HOME, GhostState.CHASE, GhostState.EATEN, GhostState.REVERSE,
+                                      GhostState.FRIGHTENED]
+    CLYDE, INKY, PINKY, BLINKY = range(4)
+    NO_ACTION = -1
+
+    def __init__(self, size: int, seed: int = None, tick_seconds: float = None) -> None:
+        template = Game(headless=True, tick_seconds=tick_seconds)
+        tilemap = template.tilemap
+
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.tick_seconds = template.tick_seconds
+        self.substeps = template.get_substeps(self.tick_seconds)
+        self.deltatime = self.tick_seconds / self.substeps
+        self.tile_size = tilemap.tile_size
+        self.tile_units = tilemap.tile_size * Entity.subpixels
+        self.screen_width_units = Entity.screen_width_units
+        self.screen_height_units = Entity.screen_height_units
+        self.ghost_steps = {
+            'eaten': self._get_step(Ghost.base_speed * Ghost.eaten_speed_multiplier),
+            'frightened': self._get_step(Ghost.base_speed * 0.625),
+            'slow': self._get_step(Ghost.base_speed * 0.5),
+            'normal': self._get_step(Ghost.base_speed * 0.9375)
+        }
+        self.map_height, self.map_width = tilemap.map.shape
+        self.base_tiles = tilemap.map.astype(np.int8).ravel()
+        self.source_tiles = tilemap.base_map.astype(np.int8).ravel()
+        self.base_dot_count = tilemap.dot_count
+        self.tile_value_offset = tilemap.tile_value_offset
+        self.walkable_lookup = tilemap.walkable_lookup
+        self.gate_tile = self._to_tile(tilemap.find_tile(Tile.GHOST_GATE))
+        self.house_tile = self._to_tile(tilemap.find_tile(Tile.GHOST_HOUSE_FIXED))
+        self.clyde_tile = self._to_tile(tilemap.find_tile(Tile.CLYDE_FIXED))
+
+        self.pacman_start = np.array(template.pacman.get_fixed_position(), dtype=np.int64)
+        self.ghost_start = np.array([ghost.get_fixed_position() for ghost in template.ghosts], dtype=np.int64)
+        self.ghost_start_tile = np.array([ghost.get_current_tile_coordinates() for ghost in template.ghosts],
+                                         dtype=np.int64)
+        self.dot_limit = np.array([ghost.dot_limit for ghost in template.ghosts], dtype=np.int32)
+        self.global_dot_limit = np.array([ghost.global_dot_limit for ghost in template.ghosts], dtype=np.int32)
+        self.dot_timer_max_value = template.dot_timer_max_value
+        self.global_dot_counter_deactivate_limit = template.global_dot_counter_deactivate_limit
+        self.ghost_eaten_base_value = template.ghost_eaten_base_value
+        self.action_directions = np.array(Direction.ACTIONS, dtype=np.int8)
+
+        self._row_offsets = np.arange(size, dtype=np.int64) * self.base_tiles.size
+        self.tiles = np.empty((size, self.base_tiles.size), dtype=np.int8)
+        self.dot_count = np.empty(size, dtype=np.int32)
+
+        self.pacman_x = np.empty(size, dtype=np.int64)
+        self.pacman_y = np.empty(size, dtype=np.int64)
+        self.pacman_dx = np.empty(size, dtype=np.int8)
+        self.pacman_dy = np.empty(size, dtype=np.int8)
+        self.pacman_queued_dx = np.empty(size, dtype=np.int8)
+        self.pacman_queued_dy = np.empty(size, dtype=np.int8)
+        self.freeze_frames = np.empty(size)
+
+        self.ghost_x = np.empty((size, 4), dtype=np.int64)
+        self.ghost_y = np.empty((size, 4), dtype=np.int64)
+        self.ghost_dx = np.empty((size, 4), dtype=np.int8)
+        self.ghost_dy = np.empty((size, 4), dtype=np.int8)
+        self.ghost_queued_dx = np.empty((size, 4), dtype=np.int8)
+        self.ghost_queued_dy = np.empty((size, 4), dtype=np.int8)
+        self.ghost_next_x = np.empty((size, 4), dtype=np.int64)
+        self.ghost_next_y = np.empty((size, 4), dtype=np.int64)
+        self.ghost_state = np.empty((size, 4), dtype=np.int8)
+        self.released = np.empty((size, 4), dtype=bool)
+        self.dot_counter = np.empty((size, 4), dtype=np.int32)
+
+        self.pellet_time_seconds = np.empty(size)
+        self.dot_timer_seconds = np.empty(size)
+        self.score = np.empty(size, dtype=np.int64)
+        self.ghost_eaten_points = np.empty(size, dtype=np.int64)
+        self.lives = np.empty(size, dtype=np.int8)
+        self.global_dot_counter = np.empty(size, dtype=np.int32)
+        self.global_dot_counter_active = np.empty(size, dtype=bool)
+        self.over = np.empty(size, dtype=bool)
+
+        self.reset()
+
+    def reset(self, mask: np.ndarray = None) -> None:
+        if mask is None:
+            mask = np.ones(self.size, dtype=bool)
+
+        self.tiles[mask] = self.base_tiles
+        self.dot_count[mask] = self.base_dot_count
+        self.freeze_frames[mask] = 0
+        self.dot_counter[mask] = 0
+        self.pellet_time_seconds[mask] = 0
+        self.dot_timer_seconds[mask] = self.dot_timer_max_value
+        self.score[mask] = 0
+        self.ghost_eaten_points[mask] = self.ghost_eaten_base_value
+        self.lives[mask] = 3
+        self.global_dot_counter[mask] = 0
+        self.global_dot_counter_active[mask] = False
+        self.over[mask] = False
+        self._reset_pacman(mask)
+        self._reset_ghosts(mask)
+
+    def step(self, actions: np.ndarray = None) -> tuple[np.ndarray, np.ndarray]:
+        score = self.score.copy()
+
+        if actions is not None:
+            queue = actions != self.NO_ACTION
+            directions = self.action_directions[np.where(queue, actions, 0)]
+            self.pacman_queued_dx[queue] = directions[queue, 0]
+            self.pacman_queued_dy[queue] = directions[queue, 1]
+
+        final_score = self.score.copy()
+
+        for _ in range(self.substeps):
+            over = self.over.copy()
+            self._move()
+            self.over |= self.dot_count == 0
+            final_score = np.where(over, final_score, self.score)
+
+        rewards = final_score - score
+        dones = self.over.copy()
+
+        if dones.any():
+            self.reset(dones)
+
+        return rewards, dones
+
+    def get_ghost_states(self, index: int) -> list[GhostState]:
+        return [self.ghost_states[state] for state in self.ghost_state[index]]
+
+    def snapshot(self, index: int) -> GameSnapshot:
+        changed = np.flatnonzero(self.tiles[index] != self.source_tiles)
+        pacman = (
+            int(self.pacman_x[index]), int(self.pacman_y[index]),
+            Vector2(int(self.pacman_dx[index]), int(self.pacman_dy[index])),
+            Vector2(int(self.pacman_queued_dx[index]), int(self.pacman_queued_dy[index])),
+            float(self.freeze_frames[index])
+        )
+        ghosts = tuple(
+            (
+                int(self.ghost_x[index, ghost]), int(self.ghost_y[index, ghost]),
+                Vector2(int(self.ghost_dx[index, ghost]), int(self.ghost_dy[index, ghost])),
+                Vector2(int(self.ghost_queued_dx[index, ghost]), int(self.ghost_queued_dy[index, ghost])),
+                Vector2(int(self.ghost_next_x[index, ghost]), int(self.ghost_next_y[index, ghost])),
+                self.ghost_states[self.ghost_state[index, ghost]], bool(self.released[index, ghost]),
+                int(self.dot_counter[index, ghost])
+            )
+            for ghost in range(4)
+        )
+
+        return GameSnapshot(
+            (changed, self.tiles[index, changed]),
+            pacman,
+            ghosts,
+            float(self.pellet_time_seconds[index]),
+            float(self.dot_timer_seconds[index]),
+            int(self.score[index]),
+            int(self.ghost_eaten_points[index]),
+            int(self.lives[index]),
+            int(self.global_dot_counter[index]),
+            bool(self.global_dot_counter_active[index]),
+            bool(self.over[index]),
+            None
+        )
+
+    def _move(self) -> None:
+        previous_x, previous_y = self.pacman_x.copy(), self.pacman_y.copy()
+        self._move_pacman()
+        pacman_x, pacman_y = self.get_tile_coordinates(self.pacman_x, self.pacman_y)
+        pacman_start_x, pacman_start_y, pacman_crossing = self._get_tile_path(previous_x, previous_y, self.pacman_x,
+                                                                              self.pacman_y)
+
+        for ghost in range(4):
+            previous_x, previous_y = self.ghost_x[:, ghost].copy(), self.ghost_y[:, ghost].copy()
+            self._move_ghost(ghost)
+
+            ghost_x, ghost_y = self.get_tile_coordinates(self.ghost_x[:, ghost], self.ghost_y[:, ghost])
+            ghost_start_x, ghost_start_y, ghost_crossing = self._get_tile_path(previous_x, previous_y,
+                                                                               self.ghost_x[:, ghost],
+                                                                               self.ghost_y[:, ghost])
+            pacman_start_tile = (pacman_start_x, pacman_start_y)
+            ghost_start_tile = (ghost_start_x, ghost_start_y)
+            caught = self._is_same_tile((pacman_x, pacman_y), (ghost_x, ghost_y)) \
+                | self._is_same_tile(pacman_start_tile, ghost_start_tile) \
+                | self._is_same_tile(pacman_start_tile, (ghost_x, ghost_y)) & (ghost_crossing < pacman_crossing) \
+                | self._is_same_tile((pacman_x, pacman_y), ghost_start_tile) & (pacman_crossing < ghost_crossing)
+            state = self.ghost_state[:, ghost]
+            eaten = caught & ((state == self.FRIGHTENED) | (state == self.REVERSE))
+            killed = caught & ~eaten & (state != self.EATEN)
+
+            if eaten.any():
+                self.ghost_state[eaten, ghost] = self.EATEN
+                self.score[eaten] += self.ghost_eaten_points[eaten]
+                self.ghost_eaten_points[eaten] *= 2
+
+            if killed.any():
+                self._die(killed)
+
+        self.pellet_time_seconds -= self.deltatime
+        expired = self.pellet_time_seconds <= 0
+        self.ghost_eaten_points[expired] = self.ghost_eaten_base_value
+        roaming = expired[:, None] & (self.ghost_state != self.HOME) & (self.ghost_state != self.EATEN)
+        self.ghost_state[roaming] = self.CHASE
+
+        self.dot_timer_seconds -= self.deltatime
+        expired = self.dot_timer_seconds <= 0
+        home_ghost, has_home_ghost = self._last_home_ghost()
+        release = expired & has_home_ghost
+        self.released[release, home_ghost[release]] = True
+        self.dot_timer_seconds[release] = self.dot_timer_max_value
+
+    def _move_pacman(self) -> None:
+        tile_x, tile_y = self.get_tile_coordinates(self.pacman_x, self.pacman_y)
+        walkable = self.walkable_lookup[Walker.PACMAN][0]
+
+        turn = ~self._has_collision(walkable, tile_x + self.pacman_queued_dx, tile_y + self.pacman_queued_dy)
+        self.pacman_dx = np.where(turn, self.pacman_queued_dx, self.pacman_dx)
+        self.pacman_dy = np.where(turn, self.pacman_queued_dy, self.pacman_dy)
+        self.pacman_x = np.where(turn & (self.pacman_dy != 0), self._get_tile_center(tile_x), self.pacman_x)
+        self.pacman_y = np.where(turn & (self.pacman_dx != 0), self._get_tile_center(tile_y), self.pacman_y)
+
+        frames = self.deltatime * FPS
+        frozen_frames = np.minimum(self.freeze_frames, frames)
+        self.freeze_frames -= frozen_frames
+        frozen = frozen_frames >= frames
+
+        speed = np.where(self.pellet_time_seconds > 0, Pacman.base_speed * 1.125, Pacman.base_speed)
+        step = np.round(speed * (self.deltatime - frozen_frames / FPS) * Entity.subpixels).astype(np.int64)
+        dx, dy = self.pacman_dx.astype(np.int64), self.pacman_dy.astype(np.int64)
+        x = self.pacman_x + dx * step
+        y = self.pacman_y + dy * step
+        next_x, next_y = self.get_tile_coordinates(x + dx * Pacman.lookahead_units, y + dy * Pacman.lookahead_units)
+        blocked = self._has_collision(walkable, tile_x, tile_y) | self._has_collision(walkable, next_x, next_y)
+        moved = ~frozen & ~blocked
+        stopped = ~frozen & blocked
+
+        self.pacman_x = np.where(moved, x % self.screen_width_units,
+                                 np.where(stopped, self._get_tile_center(tile_x), self.pacman_x))
+        self.pacman_y = np.where(moved, y % self.screen_height_units,
+                                 np.where(stopped, self._get_tile_center(tile_y), self.pacman_y))
+        self.pacman_dx[stopped] = 0
+        self.pacman_dy[stopped] = 0
+
+        index = self._row_offsets + tile_y * self.map_width + tile_x
+        tile = self.tiles.ravel()[index]
+        small_dot = moved & ((tile == Tile.SMALL_DOT.value) | (tile == Tile.GHOST_NO_UPWARD_TURN_DOT.value))
+        big_dot = moved & (tile == Tile.BIG_DOT.value)
+
+        if small_dot.any():
+            self._eat_small_dot(small_dot, index, tile)
+
+        if big_dot.any():
+            self._eat_big_dot(big_dot, index)
+
+    def _eat_small_dot(self, mask: np.ndarray, index: np.ndarray, tile: np.ndarray) -> None:
+        self.freeze_frames[mask] = 1
+        self.tiles.ravel()[index[mask]] = np.where(tile[mask] == Tile.GHOST_NO_UPWARD_TURN_DOT.value,
+                                                   Tile.GHOST_NO_UPWARD_TURN.value, Tile.AIR.value)
+        self.dot_count[mask] -= 1
+        self.dot_timer_seconds[mask] = self.dot_timer_max_value
+        self.score[mask] += 10
+        self.global_dot_counter[mask & self.global_dot_counter_active] += 1
+
+        home_ghost, has_home_ghost = self._last_home_ghost()
+        counting = mask & has_home_ghost
+        rows = np.flatnonzero(counting)
+        ghosts = home_ghost[counting]
+        global_dot_counter = self.global_dot_counter[counting]
+        self.dot_counter[rows, ghosts] += global_dot_counter == 0
+        self.released[rows, ghosts] |= global_dot_counter == self.global_dot_limit[ghosts]
+
+        deactivate = mask & (self.global_dot_counter == self.global_dot_counter_deactivate_limit) \
+            & (self.ghost_state[:, self.CLYDE] == self.HOME)
+        self.global_dot_counter[deactivate] = 0
+        self.global_dot_counter_active[deactivate] = False
+
+    def _eat_big_dot(self, mask: np.ndarray, index: np.ndarray) -> None:
+        self.freeze_frames[mask] = 3
+        self.tiles.ravel()[index[mask]] = Tile.AIR.value
+        self.dot_count[mask] -= 1
+        self.score[mask] += 50
+        self.pellet_time_seconds[mask] = 6
+
+        frightened = mask[:, None] & (self.ghost_state != self.HOME) & (self.ghost_state != self.EATEN)
+        tile_x, tile_y = self.get_tile_coordinates(self.ghost_x, self.ghost_y)
+        self.ghost_state[frightened] = self.REVERSE
+        self.ghost_next_x[frightened] = ((tile_x + self.ghost_dx) % self.map_width)[frightened]
+        self.ghost_next_y[frightened] = ((tile_y + self.ghost_dy) % self.map_height)[frightened]
+
+    def _move_ghost(self, ghost: int) -> None:
+        state = self.ghost_state[:, ghost]
+        tile_x, tile_y = self.get_tile_coordinates(self.ghost_x[:, ghost], self.ghost_y[:, ghost])
+        tile = self.tiles.ravel()[self._row_offsets + tile_y * self.map_width + tile_x]
+
+        self.released[:, ghost] |= (state == self.CHASE) | (~self.global_dot_counter_active & (state == self.HOME) & (
+                self.dot_counter[:, ghost] >= self.dot_limit[ghost]))
+
+        in_ghost_house = (tile == Tile.GHOST_HOUSE.value) | (tile == Tile.GHOST_HOUSE_FIXED.value) \
+            | (tile == Tile.GHOST_GATE.value)
+        state[(state == self.HOME) & ~in_ghost_house] = self.CHASE
+
+        returned = (state == self.EATEN) & (tile == Tile.GHOST_HOUSE.value)
+
+        if returned.any():
+            self.ghost_dx[returned, ghost] = 0
+            self.ghost_dy[returned, ghost] = 0
+            self.ghost_queued_dx[returned, ghost] = Direction.LEFT.x
+            self.ghost_queued_dy[returned, ghost] = Direction.LEFT.y
+            state[returned] = self.HOME
+            self.ghost_next_x[returned, ghost] = tile_x[returned]
+            self.ghost_next_y[returned, ghost] = tile_y[returned]
+            self.released[returned, ghost] = False
+
+        deciding = self.released[:, ghost] & (tile_x == self.ghost_next_x[:, ghost]) \
+            & (tile_y == self.ghost_next_y[:, ghost])
+
+        if deciding.any():
+            self._choose_next_direction(ghost, np.flatnonzero(deciding), tile_x, tile_y)
+
+        dx = self.ghost_dx[:, ghost]
+        dy = self.ghost_dy[:, ghost]
+        step = np.where(state == self.EATEN, self.ghost_steps['eaten'],
+                        np.where((state == self.FRIGHTENED) | (state == self.REVERSE), self.ghost_steps['frightened'],
+                                 np.where(tile == Tile.GHOST_SLOW.value, self.ghost_steps['slow'],
+                                          self.ghost_steps['normal'])))
+        x = (self.ghost_x[:, ghost] + dx * step) % self.screen_width_units
+        y = (self.ghost_y[:, ghost] + dy * step) % self.screen_height_units
+        tile_x, tile_y = self.get_tile_coordinates(x, y)
+        self.ghost_x[:, ghost] = np.where(dy != 0, self._get_tile_center(tile_x), x)
+        self.ghost_y[:, ghost] = np.where(dx != 0, self._get_tile_center(tile_y), y)
+
+    def _choose_next_direction(self, ghost: int, rows: np.ndarray, tile_x: np.ndarray, tile_y: np.ndarray) -> None:
+        dx = self.ghost_dx[rows, ghost] = self.ghost_queued_dx[rows, ghost]
+        dy = self.ghost_dy[rows, ghost] = self.ghost_queued_dy[rows, ghost]
+        next_x = self.ghost_next_x[rows, ghost] = (tile_x[rows] + dx) % self.map_width
+        next_y = self.ghost_next_y[rows, ghost] = (tile_y[rows] + dy) % self.map_height
+        state = self.ghost_state[rows, ghost]
+
+        reverse = state == self.REVERSE
+        self.ghost_state[rows[reverse], ghost] = self.FRIGHTENED
+        self.ghost_queued_dx[rows[reverse], ghost] = -dx[reverse]
+        self.ghost_queued_dy[rows[reverse], ghost] = -dy[reverse]
+
+        choosing = ~reverse
+        rows, dx, dy, next_x, next_y, state = (rows[choosing], dx[choosing], dy[choosing], next_x[choosing],
+                                               next_y[choosing], state[choosing])
+        choice_x = np.stack([next_x + dx, next_x + dy, next_x - dy], axis=1)
+        choice_y = np.stack([next_y + dy, next_y + dx, next_y - dx], axis=1)
+
+        target_x, target_y = self._choose_targets(ghost, rows, state, tile_x[rows], tile_y[rows], choice_x, choice_y)
+
+        upward = tile_y[rows, None] > choice_y
+        walkable = np.where(
+            ((state == self.HOME) | (state == self.EATEN))[:, None],
+            self._is_walkable(self.walkable_lookup[Walker.GHOST_HOME], rows, choice_x, choice_y, upward),
+            self._is_walkable(self.walkable_lookup[Walker.GHOST], rows, choice_x, choice_y, upward)
+        )
+        distance = np.where(walkable, (choice_x - target_x[:, None]) ** 2 + (choice_y - target_y[:, None]) ** 2,
+                            np.iinfo(np.int64).max)
+        best = np.argmin(distance, axis=1)
+        chosen = walkable.any(axis=1)
+        rows, best = rows[chosen], best[chosen]
+        self.ghost_queued_dx[rows, ghost] = (choice_x[chosen, best] - next_x[chosen])
+        self.ghost_queued_dy[rows, ghost] = (choice_y[chosen, best] - next_y[chosen])
+
+    def _choose_targets(self, ghost: int, rows: np.ndarray, state: np.ndarray, tile_x: np.ndarray,
+                        tile_y: np.ndarray, choice_x: np.ndarray, choice_y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        pacman_x, pacman_y = self.get_tile_coordinates(self.pacman_x[rows], self.pacman_y[rows])
+        pacman_dx = self.pacman_dx[rows].astype(np.int64)
+        pacman_dy = self.pacman_dy[rows].astype(np.int64)
+        idle = (pacman_dx == 0) & (pacman_dy == 0)
+        pacman_dx = np.where(idle, self.pacman_queued_dx[rows], pacman_dx)
+        pacman_dy = np.where(idle, self.pacman_queued_dy[rows], pacman_dy)
+        up = (pacman_dx == Direction.UP.x) & (pacman_dy == Direction.UP.y)
+
+        match ghost:
+            case self.BLINKY:
+                chase_x, chase_y = pacman_x, pacman_y
+            case self.PINKY:
+                chase_x = pacman_x - 4 * up + 4 * pacman_dx
+                chase_y = pacman_y + 4 * pacman_dy
+            case self.INKY:
+                blinky_x, blinky_y = self.get_tile_coordinates(self.ghost_x[rows, self.BLINKY],
+                                                            self.ghost_y[rows, self.BLINKY])
+                chase_x = 2 * (pacman_x - 2 * up + pacman_dx) - blinky_x
+                chase_y = 2 * (pacman_y + pacman_dy) - blinky_y
+            case _:
+                far = (pacman_x - tile_x) ** 2 + (pacman_y - tile_y) ** 2 >= 64
+                chase_x = np.where(far, pacman_x, self.clyde_tile[0])
+                chase_y = np.where(far, pacman_y, self.clyde_tile[1])
+
+        random_choice = self.rng.integers(0, 3, size=rows.size)
+        arange = np.arange(rows.size)
+        target_x = np.select(
+            [state == self.HOME, state == self.CHASE, state == self.EATEN],
+            [self.gate_tile[0], chase_x, self.house_tile[0]],
+            choice_x[arange, random_choice]
+        )
+        target_y = np.select(
+            [state == self.HOME, state == self.CHASE, state == self.EATEN],
+            [self.gate_tile[1], chase_y, self.house_tile[1]],
+            choice_y[arange, random_choice]
+        )
+
+        return target_x, target_y
+
+    def _die(self, mask: np.ndarray) -> None:
+        self.lives[mask] -= 1
+        self.global_dot_counter_active[mask] = True
+        self.global_dot_counter[mask] = 0
+        self.dot_timer_seconds[mask] = self.dot_timer_max_value
+        self.over |= mask & (self.lives <= 0)
+        self._reset_pacman(mask)
+        self._reset_ghosts(mask)
+
+    def _reset_pacman(self, mask: np.ndarray) -> None:
+        self.pacman_x[mask] = self.pacman_start[0]
+        self.pacman_y[mask] = self.pacman_start[1]
+        self.pacman_dx[mask] = 0
+        self.pacman_dy[mask] = 0
+        self.pacman_queued_dx[mask] = 0
+        self.pacman_queued_dy[mask] = 0
+
+    def _reset_ghosts(self, mask: np.ndarray) -> None:
+        self.ghost_x[mask] = self.ghost_start[:, 0]
+        self.ghost_y[mask] = self.ghost_start[:, 1]
+        self.ghost_dx[mask] = 0
+        self.ghost_dy[mask] = 0
+        self.ghost_queued_dx[mask] = Direction.LEFT.x
+        self.ghost_queued_dy[mask] = Direction.LEFT.y
+        self.ghost_next_x[mask] = self.ghost_start_tile[:, 0]
+        self.ghost_next_y[mask] = self.ghost_start_tile[:, 1]
+        self.ghost_state[mask] = self.HOME
+        self.released[mask] = False
+
+    def _last_home_ghost(self) -> tuple[np.ndarray, np.ndarray]:
+        home = self.ghost_state == self.HOME
+
+        return 3 - np.argmax(home[:, ::-1], axis=1), home.any(axis=1)
+
+    def get_tile_coordinates(self, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        return x // self.tile_units % self.map_width, y // self.tile_units % self.map_height
+
+    def _get_tile_center(self, tile: np.ndarray) -> np.ndarray:
+        return tile * self.tile_units + self.tile_units // 2
+
+    def _get_tile_path(self, previous_x: np.ndarray, previous_y: np.ndarray, x: np.ndarray,
+                       y: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        start_x, start_y = self.get_tile_coordinates(previous_x, previous_y)
+        tile_x, tile_y = self.get_tile_coordinates(x, y)
+        horizontal = start_x != tile_x
+        moved = horizontal | (start_y != tile_y)
+        start = np.where(horizontal, previous_x, previous_y)
+        span = np.where(horizontal, self.screen_width_units, self.screen_height_units)
+        delta = (np.where(horizontal, x, y) - start + span // 2) % span - span // 2
+        boundary = (start // self.tile_units + (delta > 0)) * self.tile_units
+        crossing = np.clip((boundary - start) / np.where(moved, delta, 1), 0.0, 1.0)
+
+        return start_x, start_y, np.where(moved, crossing, 1.0)
+
+    def _get_step(self, speed: float) -> int:
+        return round(speed * self.deltatime * Entity.subpixels)
+
+    @staticmethod
+    def _is_same_tile(tile: tuple[np.ndarray, np.ndarray], other_tile: tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+        return (tile[0] == other_tile[0]) & (tile[1] == other_tile[1])
+
+    def _is_walkable(self, lookup: np.ndarray, rows: np.ndarray, x: np.ndarray, y: np.ndarray,
+                     upward: np.ndarray) -> np.ndarray:
+        in_bounds = (0 <= x) & (x < self.map_width) & (0 <= y) & (y < self.map_height)
+        index = self._row_offsets[rows, None] + np.where(in_bounds, y * self.map_width + x, 0)
+
+        return ~in_bounds | lookup[upward.astype(np.int64), self.tiles.ravel()[index] + self.tile_value_offset]
+
+    def _has_collision(self, lookup: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        in_bounds = (0 <= x) & (x < self.map_width) & (0 <= y) & (y < self.map_height)
+        index = self._row_offsets + np.where(in_bounds, y * self.map_width + x, 0)
+
+        return in_bounds & ~lookup[self.tiles.ravel()[index] + self.tile_value_offset]
+
+    @staticmethod
+    def _to_tile(position) -> np.ndarray:
+        return np.array([int(position.x), int(position.y)], dtype=np.int64)
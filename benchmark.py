@@ -0,0 +1,208 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from enums.direction import Direction
+from game import Game
+from world.compiled_map import CompiledMap
+from world.tilemap import Tilemap
+
+
+class Benchmark:
+    compare_metric: str = 'p50_us'
+    min_ghost_decisions: int = 500
+
+    def __init__(self, ticks: int = 6000, seed: int = 1) -> None:
+        self.ticks = ticks
+        self.seed = seed
+        self.results: dict[str, dict[str, float]] = {}
+
+    def run(self) -> dict[str, dict[str, float]]:
+        self._bench_move()
+        self._bench_ghost_decisions()
+        self._bench_drawing()
+        self._bench_loading()
+
+        return self.results
+
+    def compare(self, baseline: dict[str, dict[str, float]], threshold: float) -> list[str]:
+        regressions = []
+
+        for name, result in self.results.items():
+            if name not in baseline:
+                continue
+
+            current = result[self.compare_metric]
+            previous = baseline[name][self.compare_metric]
+
+            if current > previous * (1 + threshold):
+                regressions.append(f'{name}: {self.compare_metric} {previous:.1f} -> {current:.1f} '
+                                   f'(+{(current / previous - 1) * 100:.0f}%)')
+
+        return regressions
+
+    def _actions(self) -> list[Direction | None]:
+        rng = random.Random(self.seed)
+        return [rng.choice(Direction.ACTIONS) if rng.random() < 0.05 else None for _ in range(self.ticks)]
+
+    def _play(self, game: Game, on_tick) -> None:
+        game.reset(self.seed)
+
+        for action in self._actions():
+            if action is not None:
+                game.pacman.queue_direction(action)
+
+            game.deltatime = game.tick_seconds
+            on_tick(game)
+
+            if game.over or game.tilemap.is_empty():
+                game.reset(self.seed)
+
+    def _bench_move(self) -> None:
+        latencies = []
+
+        def on_tick(game: Game) -> None:
+            start = time.perf_counter_ns()
+            game._move()
+            latencies.append(time.perf_counter_ns() - start)
+
+        self._play(Game(headless=True), on_tick)
+        self._record('game_move', latencies)
+
+    def _bench_ghost_decisions(self) -> None:
+        game = Game(headless=True)
+        latencies: dict[str, list[int]] = {}
+
+        def timed(name: str, choose_next_direction):
+            def wrapper() -> None:
+                start = time.perf_counter_ns()
+                choose_next_direction()
+                latencies[name].append(time.perf_counter_ns() - start)
+
+            return wrapper
+
+        def on_tick(current_game: Game) -> None:
+            for ghost in current_game.ghosts:
+                ghost.released = True
+
+                if '_choose_next_direction' not in vars(ghost):
+                    name = type(ghost).__name__.lower()
+                    latencies.setdefault(name, [])
+                    ghost._choose_next_direction = timed(name, ghost._choose_next_direction)
+
+            current_game._move()
+
+        self._play(game, on_tick)
+
+        for name, ghost_latencies in latencies.items():
+            if len(ghost_latencies) < self.min_ghost_decisions:
+                raise RuntimeError(f'{name} made {len(ghost_latencies)} decisions, '
+                                   f'at least {self.min_ghost_decisions} are needed; raise --ticks')
+
+            self._record(f'{name}_choose_next_direction', ghost_latencies)
+
+    def _bench_drawing(self) -> None:
+        render_latencies = []
+        image_latencies = []
+        draw_latencies = []
+
+        def on_tick(game: Game) -> None:
+            game._move()
+
+            start = time.perf_counter_ns()
+            game.tilemap.render()
+            render_latencies.append(time.perf_counter_ns() - start)
+
+            for entity in [game.pacman] + game.ghosts:
+                start = time.perf_counter_ns()
+                entity.image.draw(game.draw_surface)
+                image_latencies.append(time.perf_counter_ns() - start)
+
+            start = time.perf_counter_ns()
+            game._draw()
+            draw_latencies.append(time.perf_counter_ns() - start)
+
+        self._play(Game(), on_tick)
+        self._record('tilemap_render', render_latencies)
+        self._record('animated_image_draw', image_latencies)
+        self._record('game_draw', draw_latencies)
+
+    def _bench_loading(self) -> None:
+        self._record('map_load', self._time_calls(self._load_map, 50))
+        self._record('startup_headless', self._time_calls(lambda: Game(headless=True), 20))
+        self._record('startup_windowed', self._time_calls(Game, 5))
+
+    def _record(self, name: str, latencies_ns: list[int]) -> None:
+        if not latencies_ns:
+            return
+
+        latencies = np.array(latencies_ns, dtype=np.float64) / 1000
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        self.results[name] = {
+            'count': int(latencies.size),
+            'per_second': float(1e6 / latencies.mean()),
+            'mean_us': float(latencies.mean()),
+            'p50_us': float(p50),
+            'p90_us': float(p90),
+            'p99_us': float(p99)
+        }
+
+    @staticmethod
+    def _load_map() -> Tilemap:
+        CompiledMap.clear_cache()
+        return Tilemap("data/map.json", None)
+
+    @staticmethod
+    def _time_calls(function, count: int) -> list[int]:
+        latencies = []
+
+        for _ in range(count):
+            start = time.perf_counter_ns()
+            function()
+            latencies.append(time.perf_counter_ns() - start)
+
+        return latencies
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ticks', type=int, default=6000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default='bench_output.json')
+    parser.add_argument('--baseline', default='data/benchmark_baseline.json')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    benchmark = Benchmark(args.ticks, args.seed)
+    results = benchmark.run()
+
+    for name, result in results.items():
+        print(f'{name:40} {result["per_second"]:12.0f}/s  p50 {result["p50_us"]:9.1f}us  '
+              f'p90 {result["p90_us"]:9.1f}us  p99 {result["p99_us"]:9.1f}us')
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+    elif not os.path.exists(args.baseline):
+        sys.exit(f'No baseline at {args.baseline}; run with --save-baseline to create one')
+    else:
+        with open(args.baseline, 'r') as f:
+            regressions = benchmark.compare(json.load(f), args.threshold)
+
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+
+        if regressions:
+            sys.exit(1)
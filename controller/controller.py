@@ -0,0 +1,11 @@
+import abc
+
+from pygame import Vector2
+
+
+class Controller:
+    __metaclass__ = abc.ABCMeta
+
+    @abc.abstractmethod
+    def get_direction(self, game) -> Vector2 | None:
+        return None
@@ -0,0 +1,24 @@
+import pygame
+
+from pygame import Vector2
+from pygame.locals import *
+
+from controller.controller import Controller
+from enums.direction import Direction
+
+
+class KeyboardController(Controller):
+
+    def get_direction(self, game) -> Vector2 | None:
+        pressed_keys = pygame.key.get_pressed()
+
+        if pressed_keys[K_a]:
+            return Direction.LEFT
+        elif pressed_keys[K_w]:
+            return Direction.UP
+        elif pressed_keys[K_d]:
+            return Direction.RIGHT
+        elif pressed_keys[K_s]:
+            return Direction.DOWN
+
+        return None
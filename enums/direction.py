@@ -7,3 +7,4 @@ class Direction:
     RIGHT: Vector2 = Vector2(1, 0)
     DOWN: Vector2 = Vector2(0, 1)
     NONE: Vector2 = Vector2(0, 0)
+    ACTIONS: list[Vector2] = [LEFT, UP, RIGHT, DOWN]
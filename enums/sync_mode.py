@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class SyncMode(Enum):
+    HOGWILD = 'hogwild'
+    MERGE = 'merge'
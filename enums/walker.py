@@ -0,0 +1,7 @@
+from enum import auto, Enum
+
+
+class Walker(Enum):
+    PACMAN = auto()
+    GHOST = auto()
+    GHOST_HOME = auto()
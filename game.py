@@ -1,51 +1,99 @@
 import json
+import math
+import random
 import sys
 import pygame
 from pygame import Vector2
 
 from pygame.locals import *
 
-from enums.direction import Direction
+from assets.asset_registry import AssetRegistry
+from controller.controller import Controller
+from controller.keyboard_controller import KeyboardController
 from enums.ghost_state import GhostState
+from game_snapshot import GameSnapshot
+from replay.replay_recorder import ReplayRecorder
 from sprite.blinky import Blinky
 from sprite.clyde import Clyde
+from sprite.ghost import Ghost
 from sprite.inky import Inky
-from main import DISPLAY_SURFACE, FPS, load_image, SCREEN_WIDTH, FONT_NUMBERS, COLOR_FONT, SCREEN_HEIGHT, DRAW_SURFACE
+from main import FPS, SCREEN_WIDTH, SCREEN_HEIGHT, init_display
+from sprite.hud import Hud
 from sprite.pacman import Pacman
 from sprite.pinky import Pinky
+from world.observation import Observation
 from world.tile import Tile
 from world.tilemap import Tilemap
-from world.tileset import Tileset
 
 
 class Game:
-    high_score_text_image = load_image("./images/high-score-text.png")
-    life_image = load_image("./images/pacman.png").subsurface(
-        pygame.Rect(
-            Pacman.sprite_size,
-            0,
-            Pacman.sprite_size,
-            Pacman.sprite_size
-        )
-    )
-
     dot_timer_max_value: int = 4
     global_dot_counter_deactivate_limit: int = 32
     ghost_eaten_base_value: int = 200
+    tick_seconds: float = 1 / FPS
+    max_speed: float = Ghost.base_speed * Ghost.eaten_speed_multiplier
+    max_frame_seconds: float = 0.25
+
+    def __init__(self, headless: bool = False, controller: Controller = None, observe: bool = False,
+                 seed: int = None, tick_seconds: float = None) -> None:
+        self.headless = headless
+
+        if tick_seconds is not None:
+            self.tick_seconds = tick_seconds
+
+        self.random = random.Random(seed)
+        self.recorder = None
+        self.tileset = None
+        self.controller = controller
+        self.observation = None
+        self.observe = observe
+
+        if controller is None and not headless:
+            self.controller = KeyboardController()
+
+        if not headless:
+            self.display_surface = init_display()
+            self.draw_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.hud = Hud(
+                AssetRegistry.get_font("fonts/numbers.ttf", 8),
+                AssetRegistry.get_image("images/high-score-text.png"),
+                AssetRegistry.get_image("images/pacman.png").subsurface(
+                    pygame.Rect(
+                        Pacman.sprite_size,
+                        0,
+                        Pacman.sprite_size,
+                        Pacman.sprite_size
+                    )
+                )
+            )
+            self.tileset = AssetRegistry.get_tileset("images/tileset.png")
+
+        with open("data/high_score.json", 'r') as f:
+            self.high_score = json.load(f)["high_score"]
+
+        self.reset()
+
+    def reset(self, seed: int = None) -> None:
+        if seed is not None:
+            self.random.seed(seed)
 
-    def __init__(self):
         self.deltatime = 0
-        self.tilemap = Tilemap("data/map.json", Tileset("images/tileset.png"))
+        self.over = False
+        self.tilemap = Tilemap("data/map.json", self.tileset)
+
+        if self.observe:
+            if self.observation is None:
+                self.observation = Observation(self.tilemap.map.shape)
+
+            self.observation.reset(self.tilemap)
+            self.tilemap.observation = self.observation
+
         self.pacman = Pacman(self, self._load_start_position(Tile.PLAYER_START))
         self.pellet_time_seconds = 0
         self.dot_timer_seconds = self.dot_timer_max_value
         self.score = 0
         self.ghost_eaten_points = self.ghost_eaten_base_value
         self.lives = 3
-
-        with open("data/high_score.json", 'r') as f:
-            self.high_score = json.load(f)["high_score"]
-
         self.blinky = Blinky(self, self._load_start_position(Tile.GHOST_START))
         self.pinky = Pinky(self, self._load_start_position(Tile.GHOST_START))
         self.inky = Inky(self, self._load_start_position(Tile.GHOST_START))
@@ -54,14 +102,22 @@ class Game:
         self.global_dot_counter = 0
         self.global_dot_counter_active = False
 
+        if self.observe:
+            self._observe_entities()
+
     def _move(self) -> None:
+        pacman_position = self.pacman.get_fixed_position()
         self.pacman.move(self.deltatime)
-        pacman_tile = self.pacman.get_current_tile_coordinates()
+        pacman_tile = self.pacman.get_current_tile_xy()
+        pacman_start_tile, pacman_crossing = self.pacman.get_tile_path(*pacman_position)
 
         for ghost in self.ghosts:
+            ghost_position = ghost.get_fixed_position()
             ghost.move(self.deltatime)
+            ghost_start_tile, ghost_crossing = ghost.get_tile_path(*ghost_position)
 
-            if ghost.get_current_tile_coordinates() == pacman_tile:
+            if self._is_caught(pacman_start_tile, pacman_tile, pacman_crossing, ghost_start_tile,
+                               ghost.get_current_tile_xy(), ghost_crossing):
                 if ghost.state in [GhostState.FRIGHTENED, GhostState.REVERSE]:
                     ghost.eat()
                     self.score += self.ghost_eaten_points
@@ -88,55 +144,153 @@ class Game:
                     break
 
     def _draw(self) -> None:
-        DRAW_SURFACE.fill((0, 0, 0))
+        self.draw_surface.fill((0, 0, 0))
 
-        self.tilemap.draw(DRAW_SURFACE)
-        self.pacman.draw(DRAW_SURFACE)
+        self.tilemap.draw(self.draw_surface)
+        self.pacman.draw(self.draw_surface)
 
         for ghost in self.ghosts:
-            ghost.draw(DRAW_SURFACE)
+            ghost.draw(self.draw_surface)
 
-        DRAW_SURFACE.blit(self.high_score_text_image,
-                          ((SCREEN_WIDTH - self.high_score_text_image.get_width()) / 2, 2))
+        self.hud.draw(self.draw_surface, self.score, self.high_score, self.lives)
+        self._present()
 
-        high_score_text = FONT_NUMBERS.render(f'{self.high_score}', False, COLOR_FONT)
-        DRAW_SURFACE.blit(high_score_text, ((SCREEN_WIDTH - high_score_text.get_width()) / 2, 9))
-
-        score_text = FONT_NUMBERS.render(f'{self.score}', False, COLOR_FONT)
-        DRAW_SURFACE.blit(score_text, (24, 9))
-
-        for i in range(self.lives):
-            life_image_rect = self.life_image.get_rect()
-            life_image_rect.left = i * self.life_image.get_width() + 2
-            life_image_rect.top = SCREEN_HEIGHT - self.life_image.get_height() - 2
-            DRAW_SURFACE.blit(self.life_image, life_image_rect)
-
-        pygame.transform.scale(DRAW_SURFACE, DISPLAY_SURFACE.get_size(), DISPLAY_SURFACE)
+    def _present(self) -> None:
+        pygame.transform.scale(self.draw_surface, self.display_surface.get_size(), self.display_surface)
         pygame.display.flip()
 
-    def run(self) -> None:
+    def run(self, speed: float | None = 1, frame_skip: int = 1) -> None:
+        clock = pygame.time.Clock()
+        accumulator = 0
+        elapsed_seconds = 0
+        ticks_since_draw = frame_skip
+
         while 1:
             Game.handle_events()
+
+            if speed is None:
+                ticks = 1
+            else:
+                accumulator = min(accumulator + elapsed_seconds * speed, self.max_frame_seconds * speed)
+                ticks, accumulator = divmod(accumulator, self.tick_seconds)
+
+            for _ in range(int(ticks)):
+                self.step()
+                ticks_since_draw += 1
+
+                if self.over:
+                    self._draw()
+                    self.game_over()
+
+            if ticks_since_draw >= frame_skip:
+                self._draw()
+                ticks_since_draw = 0
+
+            elapsed_seconds = 0 if speed is None else clock.tick(FPS) / 1000
+
+    def step(self, action: Vector2 = None) -> tuple[int, bool]:
+        score = self.score
+
+        if action is None and self.controller is not None:
+            action = self.controller.get_direction(self)
+
+        if action is not None:
+            self.pacman.queue_direction(action)
+
+        if self.recorder is not None:
+            self.recorder.record(self.pacman.queued_direction)
+
+        substeps = self.get_substeps(self.tick_seconds)
+        self.deltatime = self.tick_seconds / substeps
+
+        for _ in range(substeps):
             self._move()
-            self._draw()
 
             if self.tilemap.is_empty():
-                self.game_over()
+                self.over = True
 
-            self.deltatime = pygame.time.Clock().tick(FPS) * 0.001
+            if self.over:
+                break
+
+        if self.over:
+            self.stop_recording()
+
+        return self.score - score, self.over
+
+    def get_substeps(self, seconds: float) -> int:
+        return max(1, math.ceil(self.max_speed * seconds / self.tilemap.tile_size))
+
+    def start_recording(self, path: str, seed: int = None) -> None:
+        if seed is None:
+            seed = random.getrandbits(63)
+
+        self.stop_recording()
+        self.reset(seed)
+        self.recorder = ReplayRecorder(path, seed, self.tilemap.hash)
+
+    def stop_recording(self) -> None:
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def snapshot(self) -> GameSnapshot:
+        return GameSnapshot(
+            self.tilemap.snapshot(),
+            self.pacman.snapshot(),
+            tuple(ghost.snapshot() for ghost in self.ghosts),
+            self.pellet_time_seconds,
+            self.dot_timer_seconds,
+            self.score,
+            self.ghost_eaten_points,
+            self.lives,
+            self.global_dot_counter,
+            self.global_dot_counter_active,
+            self.over,
+            self.random.getstate()
+        )
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        self.tilemap.restore(snapshot.tiles)
+        self.pacman.restore(snapshot.pacman)
+
+        for ghost, ghost_snapshot in zip(self.ghosts, snapshot.ghosts):
+            ghost.restore(ghost_snapshot)
+
+        self.pellet_time_seconds = snapshot.pellet_time_seconds
+        self.dot_timer_seconds = snapshot.dot_timer_seconds
+        self.score = snapshot.score
+        self.ghost_eaten_points = snapshot.ghost_eaten_points
+        self.lives = snapshot.lives
+        self.global_dot_counter = snapshot.global_dot_counter
+        self.global_dot_counter_active = snapshot.global_dot_counter_active
+        self.over = snapshot.over
+
+        if snapshot.random_state is not None:
+            self.random.setstate(snapshot.random_state)
+
+    def _observe_entities(self) -> None:
+        channels = [
+            (self.pacman, Observation.PACMAN),
+            (self.clyde, Observation.CLYDE),
+            (self.inky, Observation.INKY),
+            (self.pinky, Observation.PINKY),
+            (self.blinky, Observation.BLINKY)
+        ]
+
+        for entity, channel in channels:
+            entity.observation_channel = channel
+            self.observation.move(channel, *entity.get_current_tile_xy())
+
+    @staticmethod
+    def _is_caught(pacman_start_tile: tuple[int, int], pacman_tile: tuple[int, int], pacman_crossing: float,
+                   ghost_start_tile: tuple[int, int], ghost_tile: tuple[int, int], ghost_crossing: float) -> bool:
+        return pacman_tile == ghost_tile or pacman_start_tile == ghost_start_tile \
+            or pacman_start_tile == ghost_tile and ghost_crossing < pacman_crossing \
+            or pacman_tile == ghost_start_tile and pacman_crossing < ghost_crossing
 
     def _load_start_position(self, tile: Tile) -> Vector2:
         tile_coordinates = self.tilemap.find_tile(tile)
-
-        if tile == Tile.GHOST_START and Tile.GHOST_HOUSE in [
-            self.tilemap.get_tile(tile_coordinates + Direction.LEFT),
-            self.tilemap.get_tile(tile_coordinates + Direction.UP),
-            self.tilemap.get_tile(tile_coordinates + Direction.RIGHT),
-            self.tilemap.get_tile(tile_coordinates + Direction.DOWN)
-        ]:
-            self.tilemap.set_tile(tile_coordinates, Tile.GHOST_HOUSE)
-        else:
-            self.tilemap.set_tile(tile_coordinates, Tile.AIR)
+        self.tilemap.set_tile(tile_coordinates, self.tilemap.get_start_replacement(tile_coordinates))
 
         return (tile_coordinates * self.tilemap.tile_size +
                 Vector2(0, self.tilemap.tile_size / 2))
@@ -187,10 +341,11 @@ class Game:
             ghost.reset()
 
         if self.lives <= 0:
-            self.game_over()
+            self.over = True
 
     def game_over(self) -> None:
         print(self.score)
+        self.stop_recording()
 
         if self.score > self.high_score:
             with open("data/high_score.json", 'w') as f:
@@ -0,0 +1,23 @@
+import numpy as np
+
+
+class GameSnapshot:
+    __slots__ = ('tiles', 'pacman', 'ghosts', 'pellet_time_seconds', 'dot_timer_seconds', 'score',
+                 'ghost_eaten_points', 'lives', 'global_dot_counter', 'global_dot_counter_active', 'over', 'random_state')
+
+    def __init__(self, tiles: tuple[np.ndarray, np.ndarray], pacman: tuple, ghosts: tuple[tuple, ...],
+                 pellet_time_seconds: float, dot_timer_seconds: float, score: int, ghost_eaten_points: int,
+                 lives: int, global_dot_counter: int, global_dot_counter_active: bool, over: bool,
+                 random_state: tuple) -> None:
+        self.tiles = tiles
+        self.pacman = pacman
+        self.ghosts = ghosts
+        self.pellet_time_seconds = pellet_time_seconds
+        self.dot_timer_seconds = dot_timer_seconds
+        self.score = score
+        self.ghost_eaten_points = ghost_eaten_points
+        self.lives = lives
+        self.global_dot_counter = global_dot_counter
+        self.global_dot_counter_active = global_dot_counter_active
+        self.over = over
+        self.random_state = random_state
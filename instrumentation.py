@@ -0,0 +1,164 @@
+import json
+import time
+
+import numpy as np
+import pygame
+
+
+class Instrumentation:
+
+    def __init__(self, capacity: int = 65536) -> None:
+        self.capacity = capacity
+        self.names: list[str] = []
+        self.name_ids = np.zeros(capacity, dtype=np.int32)
+        self.starts_ns = np.zeros(capacity, dtype=np.int64)
+        self.durations_ns = np.zeros(capacity, dtype=np.int64)
+        self.ticks = np.zeros(capacity, dtype=np.int64)
+        self.count = 0
+        self.tick = 0
+        self.counters: dict[str, int] = {'surface_allocations': 0, 'find_tile_calls': 0}
+        self._name_lookup: dict[str, int] = {}
+        self._patches: list[tuple[object, str, object, bool]] = []
+
+    def attach(self, game) -> None:
+        self._patch(game, '_move', self._timed('game.move', game._move, advances_tick=True))
+        self._patch(game, 'reset', self._after(game.reset, lambda: self._attach_state(game)))
+
+        if not game.headless:
+            self._patch(game, '_draw', self._timed('game.draw', game._draw))
+            self._patch(game, '_present', self._timed('display.present', game._present))
+            self._patch(game.hud, 'draw', self._timed('hud.draw', game.hud.draw))
+
+        self._patch_allocations()
+        self._attach_state(game)
+
+    def detach(self) -> None:
+        for owner, attribute, original, was_own_attribute in reversed(self._patches):
+            if was_own_attribute:
+                setattr(owner, attribute, original)
+            else:
+                delattr(owner, attribute)
+
+        self._patches = []
+
+    def events(self) -> list[dict]:
+        first = max(0, self.count - self.capacity)
+
+        return [
+            {
+                'name': self.names[self.name_ids[i % self.capacity]],
+                'tick': int(self.ticks[i % self.capacity]),
+                'start_us': self.starts_ns[i % self.capacity] / 1000,
+                'duration_us': self.durations_ns[i % self.capacity] / 1000
+            }
+            for i in range(first, self.count)
+        ]
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        durations: dict[str, list[float]] = {}
+
+        for event in self.events():
+            durations.setdefault(event['name'], []).append(event['duration_us'])
+
+        return {
+            name: {'count': len(values), 'mean_us': float(np.mean(values)), 'max_us': float(np.max(values))}
+            for name, values in durations.items()
+        }
+
+    def dump_json(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump({'counters': self.counters, 'summary': self.summary(), 'events': self.events()}, f)
+
+    def dump_chrome_trace(self, path: str) -> None:
+        trace_events = [
+            {'name': event['name'], 'ph': 'X', 'ts': event['start_us'], 'dur': event['duration_us'], 'pid': 1,
+             'tid': 1, 'args': {'tick': event['tick']}}
+            for event in self.events()
+        ]
+        trace_events.append({'name': 'counters', 'ph': 'C', 'ts': trace_events[-1]['ts'] if trace_events else 0,
+                             'pid': 1, 'args': self.counters})
+
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+
+    def _attach_state(self, game) -> None:
+        self._patch(game.pacman, 'move', self._timed('pacman.move', game.pacman.move))
+        self._patch(game.tilemap, 'render', self._timed('tilemap.render', game.tilemap.render))
+        self._patch(game.tilemap, 'find_tile', self._counted('find_tile_calls', game.tilemap.find_tile))
+
+        for ghost in game.ghosts:
+            name = type(ghost).__name__.lower()
+            self._patch(ghost, 'move', self._timed(f'{name}.move', ghost.move))
+            self._patch(ghost, '_choose_next_direction',
+                        self._timed(f'{name}.choose_next_direction', ghost._choose_next_direction))
+
+    def _patch_allocations(self) -> None:
+        instrumentation = self
+
+        class CountedSurface(pygame.Surface):
+
+            def __init__(self, *args, **kwargs) -> None:
+                instrumentation.counters['surface_allocations'] += 1
+                super().__init__(*args, **kwargs)
+
+        def allocating(function, dest_index: int):
+            def wrapper(*args, **kwargs):
+                if len(args) <= dest_index and kwargs.get('dest_surface') is None:
+                    self.counters['surface_allocations'] += 1
+
+                return function(*args, **kwargs)
+
+            return wrapper
+
+        self._patch(pygame, 'Surface', CountedSurface)
+        self._patch(pygame.transform, 'rotate', allocating(pygame.transform.rotate, 2))
+        self._patch(pygame.transform, 'scale', allocating(pygame.transform.scale, 2))
+
+    def _patch(self, owner, attribute: str, replacement) -> None:
+        was_own_attribute = attribute in vars(owner) if hasattr(owner, '__dict__') else True
+        self._patches.append((owner, attribute, getattr(owner, attribute), was_own_attribute))
+        setattr(owner, attribute, replacement)
+
+    def _timed(self, name: str, function, advances_tick: bool = False):
+        if name not in self._name_lookup:
+            self._name_lookup[name] = len(self.names)
+            self.names.append(name)
+
+        name_id = self._name_lookup[name]
+
+        def wrapper(*args, **kwargs):
+            if advances_tick:
+                self.tick += 1
+
+            start = time.perf_counter_ns()
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._record(name_id, start, time.perf_counter_ns() - start)
+
+        return wrapper
+
+    def _counted(self, counter: str, function):
+        def wrapper(*args, **kwargs):
+            self.counters[counter] += 1
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    @staticmethod
+    def _after(function, callback):
+        def wrapper(*args, **kwargs):
+            result = function(*args, **kwargs)
+            callback()
+            return result
+
+        return wrapper
+
+    def _record(self, name_id: int, start_ns: int, duration_ns: int) -> None:
+        i = self.count % self.capacity
+        self.name_ids[i] = name_id
+        self.starts_ns[i] = start_ns
+        self.durations_ns[i] = duration_ns
+        self.ticks[i] = self.tick
+        self.count += 1
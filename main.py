@@ -1,21 +1,29 @@
+import argparse
 import pygame
 
 from pygame.locals import *
 
-pygame.init()
-
 FPS = 60
 
-FONT_NUMBERS = pygame.font.Font("fonts/numbers.ttf", 8)
 COLOR_FONT = (222, 222, 255)
 
 SCREEN_WIDTH = 224
 SCREEN_HEIGHT = 288
-DRAW_SURFACE = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-DISPLAY_SURFACE = pygame.display.set_mode((SCREEN_WIDTH * 2, SCREEN_HEIGHT * 2), flags=DOUBLEBUF)
-pygame.display.set_caption('Pac-Man')
+SCREEN_SCALE = 2
+
+
+def init_display() -> pygame.Surface:
+    pygame.init()
+    display_surface = pygame.display.set_mode((SCREEN_WIDTH * SCREEN_SCALE, SCREEN_HEIGHT * SCREEN_SCALE),
+                                              flags=DOUBLEBUF)
+    pygame.display.set_caption('Pac-Man')
+    pygame.event.set_allowed([QUIT, KEYDOWN])
 
-pygame.event.set_allowed([QUIT, KEYDOWN])
+    return display_surface
+
+
+def load_font(path: str, size: int) -> pygame.font.Font:
+    return pygame.font.Font(path, size)
 
 
 def load_image(path):
@@ -24,6 +32,32 @@ def load_image(path):
 
 if __name__ == '__main__':
     from game import Game
-
-    game = Game()
-    game.run()
+    from replay.replay_player import ReplayPlayer
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--record', metavar='PATH')
+    parser.add_argument('--replay', metavar='PATH')
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--profile', metavar='PATH')
+    parser.add_argument('--speed', type=float, default=1, help='simulation speed multiplier, 0 for unbounded')
+    parser.add_argument('--frame-skip', type=int, default=1, help='render every Nth tick')
+    args = parser.parse_args()
+
+    if args.replay:
+        print(ReplayPlayer(args.replay).play(Game(headless=args.headless), not args.headless))
+    else:
+        game = Game(seed=args.seed)
+
+        if args.record:
+            game.start_recording(args.record, args.seed)
+
+        if args.profile:
+            import atexit
+            from instrumentation import Instrumentation
+
+            instrumentation = Instrumentation()
+            instrumentation.attach(game)
+            atexit.register(instrumentation.dump_chrome_trace, args.profile)
+
+        game.run(args.speed or None, args.frame_skip)
@@ -0,0 +1,49 @@
+import struct
+
+import pygame
+
+from main import FPS
+from replay.replay_recorder import ReplayRecorder
+
+
+class ReplayPlayer:
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        header_size = struct.calcsize(ReplayRecorder.header_format)
+        magic, version, self.seed, self.map_hash = struct.unpack_from(ReplayRecorder.header_format, data)
+
+        if magic != ReplayRecorder.magic or version != ReplayRecorder.version:
+            raise ValueError(f'{path} is not a version {ReplayRecorder.version} replay')
+
+        self.runs = list(struct.iter_unpack(ReplayRecorder.run_format, data[header_size:]))
+
+    def __iter__(self):
+        for code, run_length in self.runs:
+            direction = ReplayRecorder.directions[code]
+
+            for _ in range(run_length):
+                yield direction
+
+    def __len__(self) -> int:
+        return sum(run_length for _, run_length in self.runs)
+
+    def play(self, game, render: bool = False) -> int:
+        if game.tilemap.hash != self.map_hash:
+            raise ValueError('Replay was recorded on a different map')
+
+        game.controller = None
+        game.reset(self.seed)
+        clock = pygame.time.Clock()
+
+        for direction in self:
+            game.step(direction)
+
+            if render:
+                game.handle_events()
+                game._draw()
+                clock.tick(FPS)
+
+        return game.score
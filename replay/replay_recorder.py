@@ -0,0 +1,40 @@
+import struct
+
+from pygame import Vector2
+
+from enums.direction import Direction
+
+
+class ReplayRecorder:
+    magic: bytes = b'PACR'
+    version: int = 2
+    header_format: str = '<4sBQ32s'
+    run_format: str = '<BH'
+    max_run_length: int = 0xFFFF
+    directions: list[Vector2] = Direction.ACTIONS + [Direction.NONE]
+    direction_codes: dict[tuple[float, float], int] = {tuple(direction): i for i, direction in enumerate(directions)}
+
+    def __init__(self, path: str, seed: int, map_hash: bytes) -> None:
+        self.file = open(path, 'wb')
+        self.file.write(struct.pack(self.header_format, self.magic, self.version, seed, map_hash))
+        self.code = None
+        self.run_length = 0
+
+    def record(self, direction: Vector2) -> None:
+        code = self.direction_codes[tuple(direction)]
+
+        if code == self.code and self.run_length < self.max_run_length:
+            self.run_length += 1
+            return
+
+        self._write_run()
+        self.code = code
+        self.run_length = 1
+
+    def close(self) -> None:
+        self._write_run()
+        self.file.close()
+
+    def _write_run(self) -> None:
+        if self.run_length > 0:
+            self.file.write(struct.pack(self.run_format, self.code, self.run_length))
@@ -0,0 +1,83 @@
+import multiprocessing
+import time
+
+import pygame
+
+from game_snapshot import GameSnapshot
+
+
+class Spectator:
+
+    def __init__(self, fps: int = 30) -> None:
+        self.fps = fps
+        self.interval_seconds = 1 / fps
+        self.next_publish_time = 0
+        self.published = 0
+        renderer_connection, self.connection = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(target=_run_renderer, args=(renderer_connection, self.connection, fps),
+                                               daemon=True)
+        self.process.start()
+        renderer_connection.close()
+
+    @property
+    def open(self) -> bool:
+        return self.connection is not None
+
+    def publish(self, game, index: int = None) -> bool:
+        now = time.perf_counter()
+
+        if self.connection is None or now < self.next_publish_time:
+            return False
+
+        self.next_publish_time = now + self.interval_seconds
+
+        try:
+            self.connection.send(game.snapshot() if index is None else game.snapshot(index))
+        except OSError:
+            self.close()
+            return False
+
+        self.published += 1
+        return True
+
+    def close(self) -> None:
+        if self.connection is None:
+            return
+
+        self.connection.close()
+        self.connection = None
+        self.process.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _run_renderer(connection, publisher_connection, fps: int) -> None:
+    publisher_connection.close()
+
+    from game import Game
+
+    view = Game(controller=None)
+    clock = pygame.time.Clock()
+    snapshot: GameSnapshot | None = None
+
+    while 1:
+        Game.handle_events()
+
+        try:
+            while connection.poll():
+                snapshot = connection.recv()
+        except EOFError:
+            break
+
+        if snapshot is not None:
+            view.restore(snapshot)
+            snapshot = None
+
+        view._draw()
+        clock.tick(fps)
+
+    pygame.quit()
@@ -2,18 +2,28 @@ import pygame
 from pygame import Vector2, SurfaceType
 from pygame.sprite import Sprite
 
+from assets.asset_registry import AssetRegistry
 from enums.direction import Direction
 
 
 class AnimatedImage(Sprite):
+    rotations: dict[tuple[float, float], int] = {
+        tuple(Direction.LEFT): 0,
+        tuple(Direction.NONE): 0,
+        tuple(Direction.UP): -90,
+        tuple(Direction.DOWN): 90,
+        tuple(Direction.RIGHT): 180
+    }
+    _frames: dict[tuple[str, int, int], dict[int, list[list[SurfaceType]]]] = {}
 
     def __init__(self, path: str, position: Vector2, sprite_size: Vector2, frame_time_ms: int = 1000,
                  sprite_index: int = 0,
                  frame_index: int = 0, direction: Direction = Direction.LEFT) -> None:
         super().__init__()
         self._position = position
-        self.spritesheet = pygame.image.load(path).convert_alpha()
+        self.spritesheet = AssetRegistry.get_image(path)
         self.sprite_size = sprite_size
+        self.frames = self._load_frames(path, sprite_size)
         self._frame_index = frame_index
         self.frame_count = self.spritesheet.get_width() / self.sprite_size.x
         self.sprite_index = sprite_index
@@ -26,6 +36,7 @@ class AnimatedImage(Sprite):
         )
         self.frame_time_ms = frame_time_ms
         self.last_frame_time_ms = 0
+        self._rotation = 0
         self.direction = direction
 
     def draw(self, surface: SurfaceType):
@@ -35,24 +46,28 @@ class AnimatedImage(Sprite):
             self.last_frame_time_ms = ticks
             self.frame_index = (self.frame_index + 1) % self.frame_count
 
-        image_rect = pygame.Rect(
-            self.frame_index * self.sprite_size.x,
-            self.sprite_index * self.sprite_size.y,
-            self.sprite_size.x,
-            self.sprite_size.y
-        )
+        self.image = self.frames[self._rotation][self.sprite_index][int(self.frame_index)]
+        surface.blit(self.image, self.rect)
 
-        match self.direction:
-            case Direction.LEFT | Direction.NONE:
-                self.image = self.spritesheet.subsurface(image_rect)
-            case Direction.UP:
-                self.image = pygame.transform.rotate(self.spritesheet.subsurface(image_rect), -90)
-            case Direction.DOWN:
-                self.image = pygame.transform.rotate(self.spritesheet.subsurface(image_rect), 90)
-            case Direction.RIGHT:
-                self.image = pygame.transform.rotate(self.spritesheet.subsurface(image_rect), 180)
+    @classmethod
+    def _load_frames(cls, path: str, sprite_size: Vector2) -> dict[int, list[list[SurfaceType]]]:
+        width, height = int(sprite_size.x), int(sprite_size.y)
+        key = (path, width, height)
 
-        surface.blit(self.image, self.rect)
+        if key not in cls._frames:
+            spritesheet = AssetRegistry.get_image(path)
+            rows = [
+                [spritesheet.subsurface(pygame.Rect(x, y, width, height))
+                 for x in range(0, spritesheet.get_width() - width + 1, width)]
+                for y in range(0, spritesheet.get_height() - height + 1, height)
+            ]
+            cls._frames[key] = {
+                rotation: [[pygame.transform.rotate(frame, rotation) if rotation else frame for frame in row]
+                           for row in rows]
+                for rotation in set(cls.rotations.values())
+            }
+
+        return cls._frames[key]
 
     @property
     def position(self) -> Vector2:
@@ -64,6 +79,15 @@ class AnimatedImage(Sprite):
         self.rect.centerx = int(position.x)
         self.rect.centery = int(position.y)
 
+    @property
+    def direction(self) -> Vector2:
+        return self._direction
+
+    @direction.setter
+    def direction(self, direction: Vector2):
+        self._direction = direction
+        self._rotation = self.rotations[tuple(direction)]
+
     @property
     def frame_index(self) -> int:
         return self._frame_index
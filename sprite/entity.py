@@ -13,9 +13,16 @@ class Entity(pygame.sprite.Sprite):
 
     base_speed = FPS
     sprite_size = 0
+    subpixels: int = 256
+    screen_width_units: int = SCREEN_WIDTH * subpixels
+    screen_height_units: int = SCREEN_HEIGHT * subpixels
 
     def __init__(self, game, start_position: Vector2 = Vector2(0, 0), image: AnimatedImage = None) -> None:
         super().__init__()
+        self.game = game
+        self.observation_channel: int = None
+        self._tile_units: int = game.tilemap.tile_size * self.subpixels
+        self._map_height, self._map_width = game.tilemap.map.shape
         self.start_position: Vector2 = start_position
         self.rect: pygame.Rect = pygame.Rect(
             start_position.x - self.sprite_size / 2,
@@ -24,20 +31,45 @@ class Entity(pygame.sprite.Sprite):
             self.sprite_size
         )
         self.image: AnimatedImage = image
-        self.position: Vector2 = self.start_position.copy()
+        self.position = self.start_position
         self._direction: Vector2 = Direction.NONE
         self._queued_direction: Vector2 = Direction.NONE
-        self.game = game
 
     def draw(self, surface: SurfaceType) -> None:
         if self.image is not None:
+            self._update_image_position()
             self.image.draw(surface)
 
+    def get_current_tile_xy(self) -> tuple[int, int]:
+        return self._x // self._tile_units % self._map_width, self._y // self._tile_units % self._map_height
+
+    def get_fixed_position(self) -> tuple[int, int]:
+        return self._x, self._y
+
+    def get_tile_path(self, previous_x: int, previous_y: int) -> tuple[tuple[int, int], float]:
+        start_tile = (previous_x // self._tile_units % self._map_width,
+                      previous_y // self._tile_units % self._map_height)
+        tile = self.get_current_tile_xy()
+
+        if start_tile == tile:
+            return start_tile, 1.0
+
+        if start_tile[0] != tile[0]:
+            start, end, span = previous_x, self._x, self.screen_width_units
+        else:
+            start, end, span = previous_y, self._y, self.screen_height_units
+
+        delta = (end - start + span // 2) % span - span // 2
+        boundary = (start // self._tile_units + (delta > 0)) * self._tile_units
+
+        return start_tile, min(max((boundary - start) / delta, 0.0), 1.0)
+
     def get_current_tile_coordinates(self) -> Vector2:
-        return self.game.tilemap.get_tile_coordinates(self.position)
+        return Vector2(self.get_current_tile_xy())
 
     def get_current_tile(self) -> Tile:
-        return self.game.tilemap.get_tile(self.get_current_tile_coordinates())
+        x, y = self.get_current_tile_xy()
+        return Tile(int(self.game.tilemap.map[y, x]))
 
     def reset(self, reset_position: bool = True) -> None:
         if reset_position:
@@ -46,37 +78,51 @@ class Entity(pygame.sprite.Sprite):
         self._direction: Vector2 = Direction.NONE
         self._queued_direction: Vector2 = Direction.NONE
 
-    def _is_transparent_tile(self, tile_coordinates: Vector2) -> bool:
-        return self.game.tilemap.get_tile(tile_coordinates) in [Tile.AIR, Tile.SMALL_DOT, Tile.BIG_DOT, Tile.GHOST_SLOW]
+    def snapshot(self) -> tuple:
+        return self._x, self._y, self._direction, self._queued_direction
+
+    def restore(self, snapshot: tuple) -> None:
+        x, y, self._direction, self._queued_direction = snapshot[:4]
+        self._set_position(x, y)
+
+    def _set_position(self, x: int, y: int) -> None:
+        self._x = x % self.screen_width_units
+        self._y = y % self.screen_height_units
+
+        if self.observation_channel is not None:
+            self.game.observation.move(self.observation_channel, *self.get_current_tile_xy())
+
+    def _move_by(self, direction: Vector2, speed: float, deltatime: float) -> None:
+        step = round(speed * deltatime * self.subpixels)
+        self._set_position(self._x + int(direction.x) * step, self._y + int(direction.y) * step)
+
+    def _update_image_position(self) -> None:
+        position = self.position
+        self.rect.center = (int(position.x), int(position.y))
+        self.image.position = position
 
     def _align_to_grid(self, x: bool = True, y: bool = True) -> None:
-        current_tile = self.get_current_tile_coordinates()
+        tile_x, tile_y = self.get_current_tile_xy()
 
         if x:
-            self.position.x = (current_tile.x + 0.5) * self.game.tilemap.tile_size
+            self._x = tile_x * self._tile_units + self._tile_units // 2
 
         if y:
-            self.position.y = (current_tile.y + 0.5) * self.game.tilemap.tile_size
+            self._y = tile_y * self._tile_units + self._tile_units // 2
 
     def _get_next_tile_coordinates(self) -> Vector2:
-        current_tile_coordinates = self.get_current_tile_coordinates()
-        map_h, map_w = self.game.tilemap.map.shape
-        next_tile_coordinates = current_tile_coordinates + self._direction
+        tile_x, tile_y = self.get_current_tile_xy()
 
-        return Vector2(next_tile_coordinates.x % map_w, next_tile_coordinates.y % map_h)
+        return Vector2((tile_x + int(self._direction.x)) % self._map_width,
+                       (tile_y + int(self._direction.y)) % self._map_height)
 
     @property
     def position(self) -> Vector2:
-        return self._position
+        return Vector2(self._x / self.subpixels, self._y / self.subpixels)
 
     @position.setter
     def position(self, position: Vector2):
-        self._position = Vector2(position.x % SCREEN_WIDTH, position.y % SCREEN_HEIGHT)
-        self.rect.centerx = int(self._position.x)
-        self.rect.centery = int(self._position.y)
-
-        if self.image is not None:
-            self.image.position = self._position
+        self._set_position(round(position.x * self.subpixels), round(position.y * self.subpixels))
 
     @property
     def direction(self) -> Vector2:
@@ -1,6 +1,5 @@
 import abc
 import math
-import random
 
 from pygame import Vector2, SurfaceType
 
@@ -17,12 +16,16 @@ class Ghost(Entity):
     sprite_size = 14
     flash_speed_ms = 300
     flash_time_ms = 1500
+    eaten_speed_multiplier = 2
+    direction_indices: dict[tuple[float, float], int] = {
+        (direction.x, direction.y): i for i, direction in enumerate(Direction.ACTIONS)
+    }
 
     def __init__(self, game, start_position: Vector2 = Vector2(0, 0), sprite_index: int = 0) -> None:
         super().__init__(
             game,
             start_position,
-            AnimatedImage(
+            None if game.headless else AnimatedImage(
                 "images/ghosts.png",
                 start_position,
                 Vector2(self.sprite_size),
@@ -30,18 +33,23 @@ class Ghost(Entity):
                 sprite_index
             )
         )
-        self.state: GhostState = GhostState.HOME
+        self._state: GhostState = GhostState.HOME
         self.released: bool = False
         self.dot_counter: int = 0
         self.dot_limit: int = 0
         self.global_dot_limit: int = 0
-        self.eyes: list[GhostEye] = [GhostEye(self.position, Vector2(-3, -3)), GhostEye(self.position, Vector2(3, -3))]
+        self.eyes: list[GhostEye] = [] if game.headless else [GhostEye(self.position, Vector2(-3, -3)),
+                                                              GhostEye(self.position, Vector2(3, -3))]
         self.sprite_index: int = sprite_index
         self.next_tile: Vector2 = self._get_next_tile_coordinates()
         self._queued_direction: Vector2 = Direction.LEFT
 
     def draw(self, surface: SurfaceType) -> None:
         self._update_ghost_image()
+        self._update_image_position()
+
+        for eye in self.eyes:
+            eye.move(self.position, self._direction)
 
         if self.state != GhostState.EATEN:
             self.image.draw(surface)
@@ -61,19 +69,15 @@ class Ghost(Entity):
         if self.state == GhostState.EATEN and self.get_current_tile() == Tile.GHOST_HOUSE:
             self.reset(False)
 
-        if self.released and self.get_current_tile_coordinates() == self.next_tile:
+        tile_x, tile_y = self.get_current_tile_xy()
+
+        if self.released and tile_x == self.next_tile.x and tile_y == self.next_tile.y:
             self._direction = self._queued_direction
             self.next_tile = self._get_next_tile_coordinates()
             self._choose_next_direction()
 
-        self.position = self.position + self._direction * self._get_speed() * deltatime
-        self._align_to_grid(
-            self._direction in [Direction.UP, Direction.DOWN],
-            self._direction in [Direction.LEFT, Direction.RIGHT]
-        )
-
-        for eye in self.eyes:
-            eye.move(self.position, self._direction)
+        self._move_by(self._direction, self._get_speed(), deltatime)
+        self._align_to_grid(self._direction.y != 0, self._direction.x != 0)
 
     def eat(self) -> None:
         self.state = GhostState.EATEN
@@ -90,6 +94,13 @@ class Ghost(Entity):
         self.next_tile = self._get_next_tile_coordinates()
         self.released = False
 
+    def snapshot(self) -> tuple:
+        return super().snapshot() + (self.next_tile, self._state, self.released, self.dot_counter)
+
+    def restore(self, snapshot: tuple) -> None:
+        super().restore(snapshot)
+        self.next_tile, self.state, self.released, self.dot_counter = snapshot[4:]
+
     def _is_in_ghost_house(self) -> bool:
         return self.get_current_tile() in [Tile.GHOST_HOUSE, Tile.GHOST_HOUSE_FIXED, Tile.GHOST_GATE]
 
@@ -114,12 +125,14 @@ class Ghost(Entity):
             case GhostState.EATEN:
                 return self.game.tilemap.find_tile(Tile.GHOST_HOUSE_FIXED)
             case GhostState.FRIGHTENED:
-                return tile_choices[random.randint(0, len(tile_choices) - 1)]
+                return tile_choices[self.game.random.randint(0, len(tile_choices) - 1)]
             case _:
                 raise ValueError(f'Unknown ghost state: {self.state}')
 
     def _choose_next_direction(self) -> None:
-        if not self.game.tilemap.is_in_bounds(self.next_tile):
+        tilemap = self.game.tilemap
+
+        if not tilemap.is_in_bounds(self.next_tile):
             return
 
         if self.state == GhostState.REVERSE:
@@ -127,49 +140,53 @@ class Ghost(Entity):
             self._queued_direction = -self.direction
             return
 
-        perpendicular_direction = Vector2(self.direction.y, self.direction.x)
-        tile_choices = [
-            self.next_tile + self._direction,
-            self.next_tile + perpendicular_direction,
-            self.next_tile - perpendicular_direction,
-        ]
+        direction_index = self.direction_indices[self.direction.x, self.direction.y]
+        mode = int(self.state in [GhostState.HOME, GhostState.EATEN])
+        exits = int(tilemap.ghost_exits[mode, direction_index, int(self.next_tile.y), int(self.next_tile.x)])
+        exit_directions = tilemap.ghost_exit_directions[direction_index]
+
+        if not exits & (exits - 1) and self.state != GhostState.FRIGHTENED:
+            if exits:
+                self._queued_direction = exit_directions[exits.bit_length() - 1]
+
+            return
+
+        tile_choices = [self.next_tile + exit_direction for exit_direction in exit_directions]
         min_distance = math.inf
         target = self._choose_target(tile_choices)
 
-        for tile_coords in tile_choices:
-            if self._is_transparent_tile(tile_coords):
+        for i, tile_coords in enumerate(tile_choices):
+            if exits >> i & 1:
                 distance = math.dist(tile_coords, target)
 
                 if distance < min_distance:
                     min_distance = distance
-                    self._queued_direction = tile_coords - self.next_tile
-
-    def _is_transparent_tile(self, tile_coordinates: Vector2) -> bool:
-        current_tile_coordinates = self.get_current_tile_coordinates()
-        tile = self.game.tilemap.get_tile(tile_coordinates)
-
-        if self.state in [GhostState.HOME, GhostState.EATEN] and tile == Tile.GHOST_GATE:
-            return True
-
-        if current_tile_coordinates.y <= tile_coordinates.y \
-                and tile in [Tile.GHOST_NO_UPWARD_TURN, Tile.GHOST_NO_UPWARD_TURN_DOT]:
-            return True
-
-        return tile in [Tile.AIR, Tile.SMALL_DOT, Tile.BIG_DOT, Tile.GHOST_HOUSE, Tile.GHOST_SLOW,
-                        Tile.GHOST_HOUSE_FIXED]
+                    self._queued_direction = exit_directions[i]
 
     def _get_speed(self) -> float:
         match self.state:
             case GhostState.EATEN:
-                return self.base_speed * 2
+                return self.base_speed * self.eaten_speed_multiplier
             case GhostState.FRIGHTENED | GhostState.REVERSE:
                 return self.base_speed * 0.625
             case _:
-                if self.game.tilemap.get_tile(self.get_current_tile_coordinates()) == Tile.GHOST_SLOW:
+                if self.get_current_tile() == Tile.GHOST_SLOW:
                     return self.base_speed * 0.5
 
                 return self.base_speed * 0.9375
 
+    @property
+    def state(self) -> GhostState:
+        return self._state
+
+    @state.setter
+    def state(self, state: GhostState):
+        self._state = state
+
+        if self.observation_channel is not None:
+            self.game.observation.set_frightened(self.observation_channel,
+                                                 state in [GhostState.FRIGHTENED, GhostState.REVERSE])
+
     @abc.abstractmethod
     def _target_pacman(self) -> Vector2:
         return Vector2(0, 0)
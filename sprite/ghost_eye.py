@@ -1,44 +1,63 @@
 import pygame
 from pygame import Vector2, SurfaceType
 from pygame.sprite import Sprite
-from main import load_image
+from assets.asset_registry import AssetRegistry
 from enums.direction import Direction
 
 
 class GhostEye(Sprite):
-    eye_image = load_image("images/ghost-eye.png")
-    eye_white_image = eye_image.subsurface(pygame.Rect(0, 0, 4, 5))
-    pupil_image = eye_image.subsurface(pygame.Rect(0, 5, 2, 2))
+    eye_image = None
+    eye_white_image = None
+    pupil_image = None
+    layouts: dict[tuple[float, float], tuple[tuple[int, int], tuple[int, int]]] = {
+        tuple(Direction.LEFT): ((0, 2), (0, 4)),
+        tuple(Direction.UP): ((1, 0), (2, 0)),
+        tuple(Direction.RIGHT): ((2, 2), (4, 4)),
+        tuple(Direction.DOWN): ((1, 2), (2, 5)),
+        tuple(Direction.NONE): ((1, 2), (2, 5))
+    }
+    images: dict[tuple[float, float], SurfaceType] = {}
 
     def __init__(self, position: Vector2, offset: Vector2 = Vector2(0, 0)) -> None:
         super().__init__()
-        image_size = (2 + self.eye_white_image.get_width(), 2 + self.eye_white_image.get_height())
-        self.image = pygame.Surface(image_size, pygame.SRCALPHA)
+        self._load_images()
+        self.image = self.images[tuple(Direction.DOWN)]
         self.rect = self.image.get_rect()
         self.offset = offset
-        self.direction = Direction.DOWN
-        self.move(position, self.direction)
+        self._direction = Direction.DOWN
+        self.move(position, self._direction)
 
     def draw(self, surface: SurfaceType) -> None:
-        self.image.fill((0, 0, 0, 0))
-
-        match self.direction:
-            case Direction.LEFT:
-                self.image.blit(self.eye_white_image, (0, 2))
-                self.image.blit(self.pupil_image, (0, 4))
-            case Direction.UP:
-                self.image.blit(self.eye_white_image, (1, 0))
-                self.image.blit(self.pupil_image, (2, 0))
-            case Direction.RIGHT:
-                self.image.blit(self.eye_white_image, (2, 2))
-                self.image.blit(self.pupil_image, (4, 4))
-            case Direction.DOWN | Direction.NONE:
-                self.image.blit(self.eye_white_image, (1, 2))
-                self.image.blit(self.pupil_image, (2, 5))
-
         surface.blit(self.image, self.rect)
 
     def move(self, position: Vector2, direction: Vector2) -> None:
         self.rect.centerx = int(position.x + self.offset.x)
         self.rect.centery = int(position.y + self.offset.y)
         self.direction = direction
+
+    @property
+    def direction(self) -> Vector2:
+        return self._direction
+
+    @direction.setter
+    def direction(self, direction: Vector2):
+        if direction != self._direction:
+            self.image = self.images[tuple(direction)]
+
+        self._direction = direction
+
+    @classmethod
+    def _load_images(cls) -> None:
+        if cls.eye_image is not None:
+            return
+
+        cls.eye_image = AssetRegistry.get_image("images/ghost-eye.png")
+        cls.eye_white_image = cls.eye_image.subsurface(pygame.Rect(0, 0, 4, 5))
+        cls.pupil_image = cls.eye_image.subsurface(pygame.Rect(0, 5, 2, 2))
+        image_size = (2 + cls.eye_white_image.get_width(), 2 + cls.eye_white_image.get_height())
+
+        for direction, (eye_white_position, pupil_position) in cls.layouts.items():
+            image = pygame.Surface(image_size, pygame.SRCALPHA)
+            image.blit(cls.eye_white_image, eye_white_position)
+            image.blit(cls.pupil_image, pupil_position)
+            cls.images[direction] = image
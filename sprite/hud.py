@@ -0,0 +1,63 @@
+import pygame
+from pygame import SurfaceType
+from pygame.font import Font
+from pygame.sprite import Sprite
+from main import COLOR_FONT, SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class Hud(Sprite):
+    high_score_text_top = 2
+    number_top = 9
+    score_left = 24
+    lives_margin = 2
+
+    def __init__(self, font: Font, high_score_text_image: SurfaceType, life_image: SurfaceType) -> None:
+        super().__init__()
+        self.glyphs = [font.render(f'{digit}', False, COLOR_FONT) for digit in range(10)]
+        self.high_score_text_image = high_score_text_image
+        self.life_image = life_image
+        self.image = pygame.Surface((SCREEN_WIDTH, self.number_top + self.glyphs[0].get_height()), pygame.SRCALPHA)
+        self.rect = self.image.get_rect()
+        self.lives_image = pygame.Surface((SCREEN_WIDTH, life_image.get_height()), pygame.SRCALPHA)
+        self.lives_rect = self.lives_image.get_rect(bottom=SCREEN_HEIGHT - self.lives_margin)
+        self._scores = None
+        self._lives = None
+
+    def draw(self, surface: SurfaceType, score: int, high_score: int, lives: int) -> None:
+        if (score, high_score) != self._scores:
+            self._render_scores(score, high_score)
+
+        if lives != self._lives:
+            self._render_lives(lives)
+
+        surface.blit(self.image, self.rect)
+        surface.blit(self.lives_image, self.lives_rect)
+
+    def render_number(self, number: int) -> SurfaceType:
+        glyphs = [self.glyphs[int(digit)] for digit in f'{number}']
+        image = pygame.Surface((sum(glyph.get_width() for glyph in glyphs), self.glyphs[0].get_height()),
+                               pygame.SRCALPHA)
+        x = 0
+
+        for glyph in glyphs:
+            image.blit(glyph, (x, 0))
+            x += glyph.get_width()
+
+        return image
+
+    def _render_scores(self, score: int, high_score: int) -> None:
+        self._scores = (score, high_score)
+        self.image.fill((0, 0, 0, 0))
+        self.image.blit(self.high_score_text_image,
+                        ((SCREEN_WIDTH - self.high_score_text_image.get_width()) / 2, self.high_score_text_top))
+
+        high_score_text = self.render_number(high_score)
+        self.image.blit(high_score_text, ((SCREEN_WIDTH - high_score_text.get_width()) / 2, self.number_top))
+        self.image.blit(self.render_number(score), (self.score_left, self.number_top))
+
+    def _render_lives(self, lives: int) -> None:
+        self._lives = lives
+        self.lives_image.fill((0, 0, 0, 0))
+
+        for i in range(lives):
+            self.lives_image.blit(self.life_image, (i * self.life_image.get_width() + self.lives_margin, 0))
@@ -1,21 +1,27 @@
-import pygame
-
 from pygame import Vector2, SurfaceType
-from pygame.locals import *
 from sprite.animated_image import AnimatedImage
 from sprite.entity import Entity
 from enums.direction import Direction
+from enums.walker import Walker
+from main import FPS
 from world.tile import Tile
 
 
 class Pacman(Entity):
     sprite_size = 13
+    walker = Walker.PACMAN
+    lookahead_units: int = round(sprite_size * 0.25 * Entity.subpixels)
 
     def __init__(self, game, start_position: Vector2 = Vector2(0, 0)):
         super().__init__(
             game,
             start_position,
-            AnimatedImage("images/pacman.png", start_position, Vector2(self.sprite_size), 60)
+            None if game.headless else AnimatedImage(
+                "images/pacman.png",
+                start_position,
+                Vector2(self.sprite_size),
+                60
+            )
         )
         self.freeze_frames = 0
 
@@ -23,49 +29,61 @@ class Pacman(Entity):
         if self._direction == Direction.NONE:
             self.image.frame_index = 0
 
+        self._update_image_position()
         self.image.draw(surface)
 
     def move(self, deltatime: float) -> None:
-        self._handle_input()
+        tile_x, tile_y = self.get_current_tile_xy()
 
-        if not self._has_collision(self.get_current_tile_coordinates() + self._queued_direction):
+        if not self._has_collision(tile_x + int(self._queued_direction.x), tile_y + int(self._queued_direction.y)):
             self._direction = self._queued_direction
-            self.image.direction = self._direction
-            self._align_to_grid(
-                self._direction in [Direction.UP, Direction.DOWN],
-                self._direction in [Direction.LEFT, Direction.RIGHT]
-            )
 
-        if self.freeze_frames > 0:
-            self.freeze_frames -= 1
-        else:
-            self._attempt_move(self.position + self._direction * self._get_speed() * deltatime)
+            if self.image is not None:
+                self.image.direction = self._direction
+
+            self._align_to_grid(self._direction.y != 0, self._direction.x != 0)
+
+        frames = deltatime * FPS
+        frozen_frames = min(self.freeze_frames, frames)
+        self.freeze_frames -= frozen_frames
 
-    def _attempt_move(self, position: Vector2) -> None:
-        current_tile = self.get_current_tile_coordinates()
-        next_tile = self.game.tilemap.get_tile_coordinates(position + self._direction * self.sprite_size * 0.25)
+        if frozen_frames < frames:
+            self._attempt_move(round(self._get_speed() * (deltatime - frozen_frames / FPS) * self.subpixels))
 
-        if not self._has_collision(current_tile) and not self._has_collision(next_tile):
-            self.position = position
-            tile = self.game.tilemap.get_tile(current_tile)
+    def snapshot(self) -> tuple:
+        return super().snapshot() + (self.freeze_frames,)
 
-            if tile == Tile.SMALL_DOT or tile == Tile.GHOST_NO_UPWARD_TURN_DOT:
+    def restore(self, snapshot: tuple) -> None:
+        super().restore(snapshot)
+        self.freeze_frames = snapshot[4]
+
+        if self.image is not None:
+            self.image.direction = self._direction
+
+    def _attempt_move(self, step: int) -> None:
+        tile_x, tile_y = self.get_current_tile_xy()
+        direction_x, direction_y = int(self._direction.x), int(self._direction.y)
+        x, y = self._x + direction_x * step, self._y + direction_y * step
+        next_tile_x = (x + direction_x * self.lookahead_units) // self._tile_units % self._map_width
+        next_tile_y = (y + direction_y * self.lookahead_units) // self._tile_units % self._map_height
+
+        if not self._has_collision(tile_x, tile_y) and not self._has_collision(next_tile_x, next_tile_y):
+            self._set_position(x, y)
+            tile = self.game.tilemap.map[tile_y, tile_x]
+
+            if tile == Tile.SMALL_DOT.value or tile == Tile.GHOST_NO_UPWARD_TURN_DOT.value:
                 self.freeze_frames = 1
-                self.game.eat_small_dot(current_tile)
-            elif tile == Tile.BIG_DOT:
+                self.game.eat_small_dot(Vector2(tile_x, tile_y))
+            elif tile == Tile.BIG_DOT.value:
                 self.freeze_frames = 3
-                self.game.eat_big_dot(current_tile)
+                self.game.eat_big_dot(Vector2(tile_x, tile_y))
         else:
             self._align_to_grid()
             self._direction = Direction.NONE
 
-    def _has_collision(self, tile_coordinates: Vector2) -> bool:
-        return self.game.tilemap.is_in_bounds(tile_coordinates) and not self._is_transparent_tile(tile_coordinates)
-
-    def _is_transparent_tile(self, tile_coordinates: Vector2) -> bool:
-        return self.game.tilemap.get_tile(tile_coordinates) in [Tile.AIR, Tile.SMALL_DOT, Tile.BIG_DOT, Tile.GHOST_SLOW,
-                                                                Tile.GHOST_NO_UPWARD_TURN,
-                                                                Tile.GHOST_NO_UPWARD_TURN_DOT]
+    def _has_collision(self, tile_x: int, tile_y: int) -> bool:
+        return 0 <= tile_x < self._map_width and 0 <= tile_y < self._map_height \
+            and not self.game.tilemap.walkable[self.walker][0, tile_y, tile_x]
 
     def _get_speed(self) -> float:
         if self.game.pellet_time_seconds > 0:
@@ -73,17 +91,12 @@ class Pacman(Entity):
 
         return self.base_speed
 
-    def _handle_input(self) -> None:
-        if not self.game.tilemap.is_in_bounds(self.get_current_tile_coordinates()):
-            return
+    @property
+    def queued_direction(self) -> Vector2:
+        return self._queued_direction
 
-        pressed_keys = pygame.key.get_pressed()
+    def queue_direction(self, direction: Vector2) -> None:
+        tile_x, tile_y = self.get_current_tile_xy()
 
-        if pressed_keys[K_a]:
-            self._queued_direction = Direction.LEFT
-        elif pressed_keys[K_w]:
-            self._queued_direction = Direction.UP
-        elif pressed_keys[K_d]:
-            self._queued_direction = Direction.RIGHT
-        elif pressed_keys[K_s]:
-            self._queued_direction = Direction.DOWN
+        if 0 <= tile_x < self._map_width and 0 <= tile_y < self._map_height:
+            self._queued_direction = direction
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from batch_game import BatchGame
+from enums.direction import Direction
+from game import Game
+
+
+@pytest.mark.parametrize('tick_seconds, ticks', [(1 / 60, 1800), (8 / 60, 300)])
+def test_batch_game_matches_game_until_ghosts_are_frightened(tick_seconds, ticks):
+    count = 6
+    batch = BatchGame(count, tick_seconds=tick_seconds)
+    games = [Game(headless=True, tick_seconds=tick_seconds) for _ in range(count)]
+    rng = np.random.default_rng(0)
+    running = np.ones(count, dtype=bool)
+    compared = 0
+
+    for tick in range(ticks):
+        actions = np.where(rng.random(count) < 0.1, rng.integers(0, 4, count), -1)
+        rewards, dones = batch.step(actions)
+
+        for i in np.flatnonzero(running):
+            game = games[i]
+            reward, done = game.step(Direction.ACTIONS[actions[i]] if actions[i] >= 0 else None)
+
+            assert (reward, done) == (rewards[i], dones[i]), (tick, i)
+
+            if done or np.isin(batch.ghost_state[i], [BatchGame.FRIGHTENED, BatchGame.REVERSE]).any():
+                running[i] = False
+                continue
+
+            assert game.pacman.get_fixed_position() == (batch.pacman_x[i], batch.pacman_y[i]), (tick, i)
+            assert [ghost.get_fixed_position() for ghost in game.ghosts] == list(
+                zip(batch.ghost_x[i].tolist(), batch.ghost_y[i].tolist())), (tick, i)
+            assert [ghost.state for ghost in game.ghosts] == batch.get_ghost_states(i), (tick, i)
+            assert (game.score, game.lives) == (batch.score[i], batch.lives[i]), (tick, i)
+            compared += 1
+
+    assert compared > ticks
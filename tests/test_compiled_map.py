@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from world.compiled_map import CompiledMap
+from world.tilemap import Tilemap
+
+
+@pytest.fixture
+def map_path(tmp_path):
+    path = tmp_path / 'map.json'
+    shutil.copy('data/map.json', path)
+    CompiledMap.clear_cache()
+    yield str(path)
+    CompiledMap.clear_cache()
+
+
+def test_unwritable_directory_falls_back_to_in_memory_tables(map_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise PermissionError('read-only file system')
+
+    monkeypatch.setattr(tempfile, 'mkdtemp', fail)
+    tilemap = Tilemap(map_path, None)
+
+    assert not os.path.exists(CompiledMap.get_directory(map_path))
+    assert tilemap.distances.size > 0
+
+    cached = CompiledMap.open(map_path)
+    assert cached is not None and cached.directory is None
+
+    reloaded = Tilemap(map_path, None)
+    assert (reloaded.distances == tilemap.distances).all()
+    assert (reloaded.ghost_exits == tilemap.ghost_exits).all()
+
+
+def test_editing_the_source_invalidates_the_cache(map_path):
+    first = Tilemap(map_path, None)
+    assert CompiledMap.open(map_path).hash == first.hash
+
+    with open(map_path, 'a') as f:
+        f.write('\n')
+
+    assert CompiledMap.open(map_path) is None
+    assert Tilemap(map_path, None).hash != first.hash
+
+
+def test_distances_missing_from_the_artifact_are_built_once(map_path, monkeypatch):
+    CompiledMap.write(Tilemap(map_path, None, compiled=False), include_distances=False)
+    CompiledMap.clear_cache()
+    first = Tilemap(map_path, None)
+    builds = []
+    monkeypatch.setattr(Tilemap, '_build_distances', lambda tilemap: builds.append(tilemap))
+    second = Tilemap(map_path, None)
+
+    assert not builds
+    assert (second.distances == first.distances).all() and second.distances.size > 0
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from agent.experience_replay import ExperienceReplay
+
+
+def fill(replay: ExperienceReplay, count: int, start: int = 0) -> None:
+    states = np.arange(start, start + count)
+    replay.extend(states, states % 4, np.ones(count, dtype=np.float32), states + 1, np.zeros(count, dtype=bool))
+
+
+def test_sampling_an_empty_buffer_raises():
+    replay = ExperienceReplay(16, seed=0)
+
+    with pytest.raises(ValueError):
+        replay.sample(4)
+
+    with pytest.raises(ValueError):
+        replay.sample_prioritized(4)
+
+
+def test_extend_wraps_around_and_keeps_the_newest_transitions():
+    replay = ExperienceReplay(10, seed=0)
+    fill(replay, 7)
+    fill(replay, 7, 7)
+
+    assert len(replay) == 10
+    assert replay.position == 4
+    assert sorted(replay.transitions['state'].tolist()) == list(range(4, 14))
+
+
+def test_extend_with_an_empty_batch_does_nothing():
+    replay = ExperienceReplay(10, seed=0)
+    fill(replay, 3)
+    fill(replay, 0)
+
+    assert len(replay) == 3
+    assert replay.position == 3
+
+
+def test_prioritized_sampling_follows_priorities():
+    replay = ExperienceReplay(1000, alpha=1, seed=0)
+    fill(replay, 1000)
+    priorities = np.ones(1000)
+    priorities[:10] = 100
+    replay.update_priorities(np.arange(1000), priorities)
+
+    indices, transitions, weights = replay.sample_prioritized(20000)
+
+    assert np.mean(indices < 10) == pytest.approx(1000 / 1990, abs=0.02)
+    assert (transitions['state'] == indices).all()
+    assert weights.max() == 1 and weights[indices < 10].max() < weights[indices >= 10].min()
+
+
+def test_memory_mapped_buffer_is_reopened(tmp_path):
+    path = str(tmp_path / 'replay.npy')
+    replay = ExperienceReplay(100, (3,), np.uint8, path=path)
+    states = np.arange(60, dtype=np.uint8).reshape(20, 3)
+    replay.extend(states, np.zeros(20, dtype=np.int8), np.ones(20, dtype=np.float32), states,
+                  np.zeros(20, dtype=bool))
+    replay.flush()
+    del replay
+
+    reopened = ExperienceReplay(100, (3,), np.uint8, path=path)
+
+    assert len(reopened) == 20
+    assert (reopened.transitions['state'][:20] == states).all()
+
+    with pytest.raises(ValueError):
+        ExperienceReplay(50, (3,), np.uint8, path=path)
@@ -0,0 +1,52 @@
+import os
+import stat
+
+import numpy as np
+import pytest
+
+from agent.q_table_checkpoint import QTableCheckpoint
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / 'q.npy')
+    q_table = np.random.default_rng(0).random((100, 4), dtype=np.float32)
+
+    with QTableCheckpoint(path, 0) as checkpoint:
+        assert checkpoint.save(q_table, 42, block=True)
+
+    loaded = QTableCheckpoint.load(path)
+
+    assert (loaded == q_table).all()
+    assert not loaded.flags.writeable
+    assert QTableCheckpoint.load(path, writable=True).flags.writeable
+    assert QTableCheckpoint.load_step(path) == 42
+    assert sorted(os.listdir(tmp_path)) == ['q.npy', 'q.npy.json']
+
+
+def test_failed_write_is_raised_instead_of_hanging(tmp_path, monkeypatch):
+    def fail(path: str, q_table: np.ndarray) -> None:
+        raise ValueError('cannot write')
+
+    checkpoint = QTableCheckpoint(str(tmp_path / 'q.npy'), 0)
+    monkeypatch.setattr(checkpoint, '_write_table', fail)
+
+    with pytest.raises(RuntimeError):
+        checkpoint.save(np.zeros((4, 4), dtype=np.float32), block=True)
+
+    checkpoint.save(np.zeros((4, 4), dtype=np.float32))
+
+    with pytest.raises(RuntimeError):
+        checkpoint.close()
+
+
+def test_replaced_files_keep_the_target_permissions(tmp_path):
+    path = str(tmp_path / 'q.npy')
+    q_table = np.zeros((4, 4), dtype=np.float32)
+
+    with QTableCheckpoint(path, 0) as checkpoint:
+        checkpoint.save(q_table, block=True)
+        assert stat.S_IMODE(os.stat(path).st_mode) == checkpoint.file_mode
+
+        os.chmod(path, 0o640)
+        checkpoint.save(q_table, block=True)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
@@ -0,0 +1,17 @@
+import os
+
+import numpy as np
+import pytest
+
+from agent.rollout_pool import RolloutPool
+
+
+def test_mismatched_warm_start_does_not_leak_shared_memory(tmp_path):
+    path = str(tmp_path / 'q.npy')
+    np.save(path, np.zeros((4, 4), dtype=np.float32))
+    segments = set(os.listdir('/dev/shm'))
+
+    with pytest.raises(ValueError):
+        RolloutPool(1, 1, checkpoint_path=path)
+
+    assert set(os.listdir('/dev/shm')) == segments
@@ -0,0 +1,77 @@
+import json
+from collections import deque
+
+from pygame import Vector2
+
+from enums.direction import Direction
+from enums.walker import Walker
+from game import Game
+from world.tile import Tile
+from world.tilemap import Tilemap
+
+
+def breadth_first_distances(walkable, start: tuple[int, int]) -> dict[tuple[int, int], int]:
+    h, w = walkable.shape
+    distances = {start: 0}
+    queue = deque([start])
+
+    while queue:
+        x, y = queue.popleft()
+
+        for direction in Direction.ACTIONS:
+            neighbour = ((x + int(direction.x)) % w, (y + int(direction.y)) % h)
+
+            if neighbour not in distances and walkable[neighbour[1], neighbour[0]]:
+                distances[neighbour] = distances[x, y] + 1
+                queue.append(neighbour)
+
+    return distances
+
+
+def test_distances_from_spawn_match_breadth_first_search():
+    game = Game(headless=True)
+    tilemap = game.tilemap
+    walkable = tilemap.walkable[Walker.PACMAN][0]
+    spawn = game.pacman.get_current_tile_xy()
+    expected = breadth_first_distances(walkable, spawn)
+
+    assert tilemap.get_tile(Vector2(spawn)) == Tile.AIR
+    assert len(expected) == (tilemap.node_index >= 0).sum()
+
+    for (x, y), distance in expected.items():
+        assert tilemap.path_distance(Vector2(spawn), Vector2(x, y)) == distance
+
+        if distance > 0:
+            step = tilemap.next_step(Vector2(spawn), Vector2(x, y))
+            h, w = walkable.shape
+            neighbour = ((spawn[0] + int(step.x)) % w, (spawn[1] + int(step.y)) % h)
+            assert expected[neighbour] == 1
+
+
+def test_all_pairs_distances_match_breadth_first_search():
+    game = Game(headless=True)
+    tilemap = game.tilemap
+    walkable = tilemap.walkable[Walker.PACMAN][0]
+    h, w = walkable.shape
+
+    for y in range(h):
+        for x in range(w):
+            if tilemap.node_index[y, x] < 0:
+                continue
+
+            for (end_x, end_y), distance in breadth_first_distances(walkable, (x, y)).items():
+                assert tilemap.distances[tilemap.node_index[y, x], tilemap.node_index[end_y, end_x]] == distance
+
+
+def test_map_without_small_dots_still_builds_distances(tmp_path):
+    with open('data/map.json', 'r') as f:
+        tiles = json.load(f)
+
+    path = tmp_path / 'map.json'
+    path.write_text(json.dumps([[Tile.AIR.value if value == Tile.SMALL_DOT.value else value for value in row]
+                                for row in tiles]))
+    tilemap = Tilemap(str(path), None, compiled=False)
+    spawn = tilemap.find_tile(Tile.PLAYER_START)
+
+    assert tilemap.path_distance(spawn, spawn) == 0
+    assert (tilemap.node_index >= 0).sum() > 1
@@ -0,0 +1,86 @@
+import argparse
+import time
+
+import numpy as np
+
+from agent.q_learning_agent import QLearningAgent
+from agent.q_table_checkpoint import QTableCheckpoint
+from agent.rollout_pool import RolloutPool
+from batch_game import BatchGame
+from enums.sync_mode import SyncMode
+from spectator import Spectator
+
+
+def train(game_count: int, steps: int, seed: int = None, checkpoint_path: str = None,
+          checkpoint_interval: float = 60, spectator: Spectator = None) -> QLearningAgent:
+    games = BatchGame(game_count, seed)
+    q_table = None if checkpoint_path is None else QTableCheckpoint.load(checkpoint_path, writable=True)
+    agent = QLearningAgent((games.map_height, games.map_width), seed=seed, q_table=q_table)
+    checkpoint = None if checkpoint_path is None else QTableCheckpoint(checkpoint_path, checkpoint_interval)
+    first_step = 0 if q_table is None else QTableCheckpoint.load_step(checkpoint_path)
+    episode_scores = []
+    scores = np.zeros(game_count, dtype=np.int64)
+    states = agent.encode_batch(games)
+    start_time = time.perf_counter()
+
+    for step in range(first_step + 1, first_step + steps + 1):
+        actions = agent.choose_actions(states)
+        rewards, dones = games.step(actions)
+        next_states = agent.encode_batch(games)
+        agent.update_batch(states, actions, rewards, next_states, dones)
+        states = next_states
+
+        scores += rewards
+        episode_scores.extend(scores[dones].tolist())
+        scores[dones] = 0
+
+        if checkpoint is not None:
+            checkpoint.maybe_save(agent.q_table, step)
+
+        if spectator is not None:
+            spectator.publish(games, 0)
+
+    if checkpoint is not None:
+        checkpoint.save(agent.q_table, first_step + steps, block=True)
+        checkpoint.close()
+
+    elapsed = time.perf_counter() - start_time
+    print(f'{game_count * steps / elapsed:.0f} steps/s, {len(episode_scores)} episodes, '
+          f'mean score {np.mean(episode_scores[-100:]) if episode_scores else 0:.1f}')
+
+    return agent
+
+
+def train_parallel(worker_count: int, game_count: int, steps: int, sync_mode: SyncMode, seed: int = None,
+                   checkpoint_path: str = None, checkpoint_interval: float = 60) -> None:
+    with RolloutPool(worker_count, game_count, sync_mode, seed=seed, checkpoint_path=checkpoint_path,
+                     checkpoint_interval=checkpoint_interval) as pool:
+        stats = pool.run(steps)
+
+    print(f'{stats.steps_per_second:.0f} steps/s, {stats.episodes} episodes, mean score {stats.mean_score:.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=1024)
+    parser.add_argument('--steps', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--sync', type=SyncMode, choices=list(SyncMode), default=SyncMode.HOGWILD)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--checkpoint', metavar='PATH')
+    parser.add_argument('--checkpoint-interval', type=float, default=60)
+    parser.add_argument('--spectate', action='store_true', help='watch the first game in a separate window')
+    parser.add_argument('--spectate-fps', type=int, default=30)
+    args = parser.parse_args()
+
+    if args.spectate and args.workers > 1:
+        parser.error('--spectate is only supported with a single worker')
+
+    if args.workers > 1:
+        train_parallel(args.workers, args.games, args.steps, args.sync, args.seed, args.checkpoint,
+                       args.checkpoint_interval)
+    elif args.spectate:
+        with Spectator(args.spectate_fps) as spectator:
+            train(args.games, args.steps, args.seed, args.checkpoint, args.checkpoint_interval, spectator)
+    else:
+        train(args.games, args.steps, args.seed, args.checkpoint, args.checkpoint_interval)
@@ -0,0 +1,144 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+
+class CompiledMap:
+    version: int = 3
+    suffix: str = '.compiled'
+    arrays: list[str] = ['map', 'tile_positions', 'ghost_exits']
+    distance_arrays: list[str] = ['node_index', 'distances', 'next_steps']
+    _cache: dict[tuple[str, int, int], 'CompiledMap'] = {}
+
+    def __init__(self, directory: str | None, meta: dict, arrays: dict[str, np.ndarray]) -> None:
+        self.directory = directory
+        self.version = meta['version']
+        self.hash = bytes.fromhex(meta['hash'])
+        self.dot_count: int = meta['dot_count']
+        self.has_distances: bool = meta['has_distances']
+        self.map: np.ndarray = arrays['map']
+        self.ghost_exits: np.ndarray = arrays['ghost_exits']
+        self.tile_positions: dict[int, list[tuple[int, int]]] = {}
+
+        for value, y, x in arrays['tile_positions'].tolist():
+            self.tile_positions.setdefault(value, []).append((y, x))
+
+        self.node_index, self.distances, self.next_steps = [
+            arrays[name] if self.has_distances else None for name in self.distance_arrays
+        ]
+
+    @classmethod
+    def load(cls, directory: str) -> 'CompiledMap':
+        with open(os.path.join(directory, 'meta.json'), 'r') as f:
+            meta = json.load(f)
+
+        names = cls.arrays + (cls.distance_arrays if meta['has_distances'] else [])
+        arrays = {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode='r') for name in names}
+
+        return cls(directory, meta, arrays)
+
+    @classmethod
+    def get_directory(cls, source_path: str) -> str:
+        return os.path.splitext(source_path)[0] + cls.suffix
+
+    @classmethod
+    def open(cls, source_path: str) -> 'CompiledMap | None':
+        key = cls._get_key(source_path)
+
+        if key in cls._cache:
+            return cls._cache[key]
+
+        try:
+            compiled_map = cls.load(cls.get_directory(source_path))
+        except (OSError, KeyError, ValueError):
+            return None
+
+        with open(source_path, 'rb') as f:
+            source_hash = hashlib.sha256(f.read()).digest()
+
+        if compiled_map.version != cls.version or compiled_map.hash != source_hash:
+            return None
+
+        cls._cache[key] = compiled_map
+        return compiled_map
+
+    @classmethod
+    def write(cls, tilemap, include_distances: bool = True) -> 'CompiledMap':
+        directory = cls.get_directory(tilemap.path)
+        tile_positions = [
+            (value, y, x) for value, positions in sorted(tilemap._tile_positions.items()) for y, x in positions
+        ]
+        arrays = {
+            'map': tilemap.base_map.astype(np.int8),
+            'tile_positions': np.array(tile_positions, dtype=np.int16).reshape(-1, 3),
+            'ghost_exits': tilemap.ghost_exits
+        }
+        meta = {'version': cls.version, 'hash': tilemap.hash.hex(), 'dot_count': tilemap.dot_count,
+                'has_distances': include_distances}
+
+        if include_distances:
+            arrays.update(node_index=tilemap.node_index, distances=tilemap.distances, next_steps=tilemap.next_steps)
+
+        try:
+            cls._write_directory(directory, meta, arrays)
+            compiled_map = cls.load(directory)
+        except OSError:
+            compiled_map = cls(None, meta, {name: cls._freeze(array) for name, array in arrays.items()})
+
+        cls._cache[cls._get_key(tilemap.path)] = compiled_map
+        return compiled_map
+
+    def set_distances(self, node_index: np.ndarray, distances: np.ndarray, next_steps: np.ndarray) -> None:
+        self.node_index, self.distances, self.next_steps = [
+            self._freeze(array) for array in [node_index, distances, next_steps]
+        ]
+        self.has_distances = True
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls._cache.clear()
+
+    @staticmethod
+    def _freeze(array: np.ndarray) -> np.ndarray:
+        array = array.copy()
+        array.flags.writeable = False
+        return array
+
+    @staticmethod
+    def _get_key(source_path: str) -> tuple[str, int, int]:
+        stat = os.stat(source_path)
+        return os.path.abspath(source_path), stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _write_directory(directory: str, meta: dict, arrays: dict[str, np.ndarray]) -> None:
+        parent = os.path.dirname(os.path.abspath(directory))
+        temporary_directory = tempfile.mkdtemp(prefix=os.path.basename(directory) + '.', dir=parent)
+
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(temporary_directory, name + '.npy'), array)
+
+            with open(os.path.join(temporary_directory, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+
+            shutil.rmtree(directory, ignore_errors=True)
+            os.rename(temporary_directory, directory)
+        finally:
+            shutil.rmtree(temporary_directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    from world.tilemap import Tilemap
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', nargs='?', default='data/map.json')
+    parser.add_argument('--no-distances', action='store_true')
+    args = parser.parse_args()
+
+    compiled = CompiledMap.write(Tilemap(args.path, None, compiled=False), not args.no_distances)
+    print(f'{args.path} -> {compiled.directory}')
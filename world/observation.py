@@ -0,0 +1,72 @@
+import numpy as np
+
+from enums.walker import Walker
+from world.tile import Tile
+from world.tilemap import Tilemap
+
+
+class Observation:
+    WALLS, DOTS, POWER_PELLETS, PACMAN, CLYDE, INKY, PINKY, BLINKY, FRIGHTENED = range(9)
+    channel_count: int = 9
+    dot_tile_values: list[int] = [Tile.SMALL_DOT.value, Tile.GHOST_NO_UPWARD_TURN_DOT.value]
+
+    def __init__(self, map_shape: tuple[int, int]) -> None:
+        self._tensor = np.zeros((self.channel_count, *map_shape), dtype=np.uint8)
+        self._view = self._tensor.view()
+        self._view.flags.writeable = False
+        self._cells: list[tuple[int, int] | None] = [None] * self.channel_count
+        self._frightened: list[bool] = [False] * self.channel_count
+        self.tilemap = None
+
+    @property
+    def tensor(self) -> np.ndarray:
+        return self._view
+
+    def reset(self, tilemap: Tilemap) -> None:
+        self.tilemap = tilemap
+        self._tensor[:] = 0
+        self._tensor[self.WALLS] = ~tilemap.walkable[Walker.PACMAN][0]
+        self._tensor[self.DOTS] = np.isin(tilemap.map, self.dot_tile_values)
+        self._tensor[self.POWER_PELLETS] = tilemap.map == Tile.BIG_DOT.value
+        self._cells = [None] * self.channel_count
+        self._frightened = [False] * self.channel_count
+
+    def set_tile(self, x: int, y: int, tile: Tile) -> None:
+        self._tensor[self.WALLS, y, x] = not self.tilemap.walkable[Walker.PACMAN][0, y, x]
+        self._tensor[self.DOTS, y, x] = tile.value in self.dot_tile_values
+        self._tensor[self.POWER_PELLETS, y, x] = tile == Tile.BIG_DOT
+
+    def move(self, channel: int, tile_x: int, tile_y: int) -> None:
+        cell = (int(tile_x), int(tile_y))
+        old_cell = self._cells[channel]
+
+        if cell == old_cell:
+            return
+
+        if old_cell is not None:
+            self._tensor[channel, old_cell[1], old_cell[0]] = 0
+
+            if self._frightened[channel]:
+                self._tensor[self.FRIGHTENED, old_cell[1], old_cell[0]] -= 1
+
+        self._tensor[channel, cell[1], cell[0]] = 1
+
+        if self._frightened[channel]:
+            self._tensor[self.FRIGHTENED, cell[1], cell[0]] += 1
+
+        self._cells[channel] = cell
+
+    def set_frightened(self, channel: int, frightened: bool) -> None:
+        if frightened == self._frightened[channel]:
+            return
+
+        self._frightened[channel] = frightened
+        cell = self._cells[channel]
+
+        if cell is None:
+            return
+
+        if frightened:
+            self._tensor[self.FRIGHTENED, cell[1], cell[0]] += 1
+        else:
+            self._tensor[self.FRIGHTENED, cell[1], cell[0]] -= 1
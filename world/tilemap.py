@@ -1,42 +1,278 @@
+import bisect
+import hashlib
 import json
 import numpy as np
 import pygame
 
 from pygame import Vector2, SurfaceType
+from enums.direction import Direction
+from enums.walker import Walker
+from world.compiled_map import CompiledMap
 from world.tile import Tile
 from world.tileset import Tileset
 
 
 class Tilemap:
+    dot_tile_values: frozenset[int] = frozenset([
+        Tile.SMALL_DOT.value,
+        Tile.BIG_DOT.value,
+        Tile.GHOST_NO_UPWARD_TURN_DOT.value
+    ])
+    tile_value_offset: int = -min(tile.value for tile in Tile)
+    distance_walker: Walker = Walker.PACMAN
+    ghost_walkers: list[Walker] = [Walker.GHOST, Walker.GHOST_HOME]
+    start_tiles: list[Tile] = [Tile.PLAYER_START, Tile.GHOST_START]
+    walkable_tiles: dict[Walker, tuple[list[Tile], list[Tile]]] = {
+        Walker.PACMAN: (
+            [Tile.AIR, Tile.SMALL_DOT, Tile.BIG_DOT, Tile.GHOST_SLOW, Tile.GHOST_NO_UPWARD_TURN,
+             Tile.GHOST_NO_UPWARD_TURN_DOT],
+            [Tile.AIR, Tile.SMALL_DOT, Tile.BIG_DOT, Tile.GHOST_SLOW, Tile.GHOST_NO_UPWARD_TURN,
+             Tile.GHOST_NO_UPWARD_TURN_DOT]
+        ),
+        Walker.GHOST: (
+            [Tile.AIR, Tile.SMALL_DOT, Tile.BIG_DOT, Tile.GHOST_HOUSE, Tile.GHOST_SLOW, Tile.GHOST_HOUSE_FIXED,
+             Tile.GHOST_NO_UPWARD_TURN, Tile.GHOST_NO_UPWARD_TURN_DOT],
+            [Tile.AIR, Tile.SMALL_DOT, Tile.BIG_DOT, Tile.GHOST_HOUSE, Tile.GHOST_SLOW, Tile.GHOST_HOUSE_FIXED]
+        ),
+        Walker.GHOST_HOME: (
+            [Tile.AIR, Tile.SMALL_DOT, Tile.BIG_DOT, Tile.GHOST_HOUSE, Tile.GHOST_SLOW, Tile.GHOST_HOUSE_FIXED,
+             Tile.GHOST_NO_UPWARD_TURN, Tile.GHOST_NO_UPWARD_TURN_DOT, Tile.GHOST_GATE],
+            [Tile.AIR, Tile.SMALL_DOT, Tile.BIG_DOT, Tile.GHOST_HOUSE, Tile.GHOST_SLOW, Tile.GHOST_HOUSE_FIXED,
+             Tile.GHOST_GATE]
+        )
+    }
 
-    def __init__(self, path: str, tileset: Tileset, tile_size: int = 8):
-        with open(path, 'r') as f:
-            self.map = np.array(json.load(f))
+    def __init__(self, path: str, tileset: Tileset, tile_size: int = 8, compiled: bool = True):
+        self.path = path
+        compiled_map = CompiledMap.open(path) if compiled else None
 
+        if compiled_map is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+
+            self.hash = hashlib.sha256(data).digest()
+            self.base_map = np.array(json.loads(data), dtype=np.int8)
+        else:
+            self.hash = compiled_map.hash
+            self.base_map = compiled_map.map
+
+        self.map = np.array(self.base_map)
         self.tile_size = tile_size
         self.tileset = tileset
-        self.image = pygame.Surface((tile_size * self.map.shape[1], tile_size * self.map.shape[0]))
-        self.rect = self.image.get_rect()
+        self.rect = pygame.Rect(0, 0, tile_size * self.map.shape[1], tile_size * self.map.shape[0])
+        self.image = None if tileset is None else pygame.Surface(self.rect.size)
+        self._dirty_tiles: set[tuple[int, int]] = set()
+        self.observation = None
+        self._tile_positions: dict[int, list[tuple[int, int]]] = {}
+        self.dot_count = 0
+        self.walkable_lookup: dict[Walker, np.ndarray] = {}
+        self.walkable: dict[Walker, np.ndarray] = {}
+        self._build_walkable()
+        self.ghost_exit_directions: list[list[Vector2]] = []
+        self.ghost_exits = np.zeros((0, 0, 0, 0), dtype=np.uint8)
+        self.node_index = np.full(self.map.shape, -1, dtype=np.int16)
+        self.distances = np.zeros((0, 0), dtype=np.int16)
+        self.next_steps = np.zeros((0, 0), dtype=np.int8)
+
+        if compiled_map is None:
+            self._build_index()
+            self._build_ghost_exits()
+            self._build_distances()
+
+            if compiled:
+                CompiledMap.write(self)
+        else:
+            self._tile_positions = {value: positions.copy() for value, positions in compiled_map.tile_positions.items()}
+            self.dot_count = compiled_map.dot_count
+            self.ghost_exit_directions = self._get_ghost_exit_directions()
+            self.ghost_exits = compiled_map.ghost_exits
+
+            if not compiled_map.has_distances:
+                self._build_distances()
+                compiled_map.set_distances(self.node_index, self.distances, self.next_steps)
+
+            self.node_index = compiled_map.node_index
+            self.distances = compiled_map.distances
+            self.next_steps = compiled_map.next_steps
+
+        if self.image is not None:
+            self._render_all()
 
     def draw(self, surface: SurfaceType) -> None:
         self.render()
         surface.blit(self.image, self.rect)
 
     def render(self) -> None:
+        for x, y in self._dirty_tiles:
+            self._render_tile(x, y)
+
+        self._dirty_tiles.clear()
+
+    def _build_index(self) -> None:
+        self._tile_positions = {}
+
+        for (y, x), value in np.ndenumerate(self.map):
+            self._tile_positions.setdefault(int(value), []).append((y, x))
+
+        self.dot_count = sum(len(self._tile_positions.get(value, [])) for value in self.dot_tile_values)
+
+    def _build_walkable(self) -> None:
+        lookup_size = max(tile.value for tile in Tile) + self.tile_value_offset + 1
+
+        for walker, tile_lists in self.walkable_tiles.items():
+            lookup = np.zeros((2, lookup_size), dtype=bool)
+
+            for upward, tiles in enumerate(tile_lists):
+                lookup[upward, [tile.value + self.tile_value_offset for tile in tiles]] = True
+
+            self.walkable_lookup[walker] = lookup
+            self.walkable[walker] = lookup[:, self.map + self.tile_value_offset]
+
+    def _build_ghost_exits(self) -> None:
+        h, w = self.map.shape
+        y, x = np.indices((h, w))
+        self.ghost_exit_directions = self._get_ghost_exit_directions()
+        self.ghost_exits = np.zeros((len(self.ghost_walkers), len(Direction.ACTIONS), h, w), dtype=np.uint8)
+
+        for mode, walker in enumerate(self.ghost_walkers):
+            for i, direction in enumerate(Direction.ACTIONS):
+                current_y = (y - int(direction.y)) % h
+
+                for j, exit_direction in enumerate(self.ghost_exit_directions[i]):
+                    exit_x, exit_y = x + int(exit_direction.x), y + int(exit_direction.y)
+                    in_bounds = (exit_x >= 0) & (exit_x < w) & (exit_y >= 0) & (exit_y < h)
+                    walkable = self.walkable[walker][(current_y > exit_y).astype(int), exit_y % h, exit_x % w]
+                    self.ghost_exits[mode, i] |= (walkable | ~in_bounds).astype(np.uint8) << j
+
+    def _update_ghost_exits(self, x: int, y: int) -> None:
+        h, w = self.map.shape
+
+        if not self.ghost_exits.flags.writeable:
+            self.ghost_exits = self.ghost_exits.copy()
+
+        for mode, walker in enumerate(self.ghost_walkers):
+            for i, direction in enumerate(Direction.ACTIONS):
+                for j, exit_direction in enumerate(self.ghost_exit_directions[i]):
+                    next_x, next_y = x - int(exit_direction.x), y - int(exit_direction.y)
+
+                    if not (0 <= next_x < w and 0 <= next_y < h):
+                        continue
+
+                    upward = (next_y - int(direction.y)) % h > y
+                    bit = 1 << j
+
+                    if self.walkable[walker][int(upward), y, x]:
+                        self.ghost_exits[mode, i, next_y, next_x] |= bit
+                    else:
+                        self.ghost_exits[mode, i, next_y, next_x] &= 0xFF ^ bit
+
+    @staticmethod
+    def _get_ghost_exit_directions() -> list[list[Vector2]]:
+        directions = {(direction.x, direction.y): direction for direction in Direction.ACTIONS}
+
+        return [
+            [direction, directions[direction.y, direction.x], directions[-direction.y, -direction.x]]
+            for direction in Direction.ACTIONS
+        ]
+
+    def _get_spawn_map(self) -> np.ndarray:
+        spawn_map = self.map.copy()
+
+        for tile in self.start_tiles:
+            for y, x in self._tile_positions.get(tile.value, []):
+                spawn_map[y, x] = self._get_start_replacement(spawn_map, x, y).value
+
+        return spawn_map
+
+    def _build_distances(self) -> None:
+        h, w = self.map.shape
+        self.node_index = np.full(self.map.shape, -1, dtype=np.int16)
+        walkable = self.walkable_lookup[self.distance_walker][0, self._get_spawn_map() + self.tile_value_offset]
+        maze = np.zeros_like(walkable)
+
+        for cell in self._tile_positions.get(Tile.PLAYER_START.value, [])[:1]:
+            maze[cell] = True
+
+        frontier = maze.copy()
+
+        while frontier.any():
+            frontier = (np.roll(frontier, 1, 0) | np.roll(frontier, -1, 0) | np.roll(frontier, 1, 1)
+                        | np.roll(frontier, -1, 1)) & walkable & ~maze
+            maze |= frontier
+
+        node_y, node_x = np.nonzero(maze)
+        n = node_y.size
+        self.node_index[node_y, node_x] = np.arange(n)
+        neighbours = np.stack([self.node_index[(node_y + int(direction.y)) % h, (node_x + int(direction.x)) % w]
+                               for direction in Direction.ACTIONS])
+
+        self.distances = np.full((n, n), -1, dtype=np.int16)
+        reached = np.eye(n, dtype=bool)
+        self.distances[reached] = 0
+        padded_frontier = np.zeros((n, n + 1), dtype=bool)
+        padded_frontier[:, :n] = reached
+        distance = 0
+
+        while padded_frontier.any():
+            distance += 1
+            frontier = np.zeros((n, n), dtype=bool)
+
+            for neighbour in neighbours:
+                frontier |= padded_frontier[:, neighbour]
+
+            frontier &= ~reached
+            reached |= frontier
+            self.distances[frontier] = distance
+            padded_frontier[:, :n] = frontier
+
+        self.next_steps = np.full((n, n), -1, dtype=np.int8)
+
+        for i in reversed(range(len(neighbours))):
+            valid = neighbours[i] >= 0
+            closer = np.zeros((n, n), dtype=bool)
+            closer[valid] = self.distances[neighbours[i][valid]] == self.distances[valid] - 1
+            self.next_steps[closer & (self.distances > 0)] = i
+
+    def _render_all(self) -> None:
         m, n = self.map.shape
 
         for y in range(m):
             for x in range(n):
-                tile = self.map[y, x]
+                self._render_tile(x, y)
+
+        self._dirty_tiles.clear()
+
+    def _render_tile(self, x: int, y: int) -> None:
+        tile = self.map[y, x]
+
+        if tile == Tile.GHOST_NO_UPWARD_TURN_DOT.value:
+            tile = Tile.SMALL_DOT.value
+        elif tile == Tile.GHOST_NO_UPWARD_TURN.value:
+            tile = Tile.AIR.value
+
+        if tile >= 0:
+            self.image.blit(self.tileset.tiles[tile], (x * self.tile_size, y * self.tile_size))
+        else:
+            self.image.fill((0, 0, 0), (x * self.tile_size, y * self.tile_size, self.tile_size, self.tile_size))
 
-                if tile == Tile.GHOST_NO_UPWARD_TURN_DOT.value:
-                    tile = Tile.SMALL_DOT.value
-                elif tile == Tile.GHOST_NO_UPWARD_TURN.value:
-                    tile = Tile.AIR.value
+    def get_start_replacement(self, position: Vector2) -> Tile:
+        if not self.is_in_bounds(position):
+            return Tile.AIR
 
-                if tile >= 0:
-                    tile_image = self.tileset.tiles[tile]
-                    self.image.blit(tile_image, (x * self.tile_size, y * self.tile_size))
+        return self._get_start_replacement(self.map, int(position.x), int(position.y))
+
+    @staticmethod
+    def _get_start_replacement(tiles: np.ndarray, x: int, y: int) -> Tile:
+        h, w = tiles.shape
+
+        if tiles[y, x] == Tile.GHOST_START.value and any(
+            0 <= x + int(direction.x) < w and 0 <= y + int(direction.y) < h
+            and tiles[y + int(direction.y), x + int(direction.x)] == Tile.GHOST_HOUSE.value
+            for direction in Direction.ACTIONS
+        ):
+            return Tile.GHOST_HOUSE
+
+        return Tile.AIR
 
     def get_tile(self, position: Vector2) -> Tile:
         if self.is_in_bounds(position):
@@ -46,24 +282,91 @@ class Tilemap:
 
     def set_tile(self, position: Vector2, tile: Tile) -> None:
         if self.is_in_bounds(position):
-            self.map[int(position.y), int(position.x)] = tile.value
+            x, y = int(position.x), int(position.y)
+            old_value = int(self.map[y, x])
+
+            if old_value == tile.value:
+                return
+
+            self.map[y, x] = tile.value
+            self._move_index_entry((y, x), old_value, tile.value)
+            ghost_exits_changed = False
+
+            old_column, new_column = old_value + self.tile_value_offset, tile.value + self.tile_value_offset
+
+            for walker, lookup in self.walkable_lookup.items():
+                self.walkable[walker][:, y, x] = lookup[:, new_column]
+                ghost_exits_changed |= walker in self.ghost_walkers and bool(
+                    (lookup[:, old_column] != lookup[:, new_column]).any()
+                )
+
+            if ghost_exits_changed:
+                self._update_ghost_exits(x, y)
+
+            if self.image is not None:
+                self._dirty_tiles.add((x, y))
+
+            if self.observation is not None:
+                self.observation.set_tile(x, y, tile)
+
+    def _move_index_entry(self, cell: tuple[int, int], old_value: int, new_value: int) -> None:
+        old_positions = self._tile_positions[old_value]
+        del old_positions[bisect.bisect_left(old_positions, cell)]
+        bisect.insort(self._tile_positions.setdefault(new_value, []), cell)
+
+        if old_value in self.dot_tile_values:
+            self.dot_count -= 1
+
+        if new_value in self.dot_tile_values:
+            self.dot_count += 1
+
+    def path_distance(self, start: Vector2, end: Vector2) -> int:
+        start_node, end_node = self._get_node(start), self._get_node(end)
+
+        if start_node < 0 or end_node < 0:
+            return -1
+
+        return int(self.distances[start_node, end_node])
+
+    def next_step(self, start: Vector2, end: Vector2) -> Vector2:
+        start_node, end_node = self._get_node(start), self._get_node(end)
+
+        if start_node < 0 or end_node < 0 or self.next_steps[start_node, end_node] < 0:
+            return Direction.NONE
+
+        return Direction.ACTIONS[self.next_steps[start_node, end_node]]
+
+    def _get_node(self, position: Vector2) -> int:
+        if self.is_in_bounds(position):
+            return int(self.node_index[int(position.y), int(position.x)])
+
+        return -1
+
+    def snapshot(self) -> tuple[np.ndarray, np.ndarray]:
+        changed = np.flatnonzero(self.map != self.base_map)
+        return changed, self.map.ravel()[changed]
+
+    def restore(self, snapshot: tuple[np.ndarray, np.ndarray]) -> None:
+        changed, values = snapshot
+        target = self.base_map.copy()
+        target.ravel()[changed] = values
+        w = self.map.shape[1]
+
+        for index in np.flatnonzero(self.map != target):
+            y, x = divmod(int(index), w)
+            self.set_tile(Vector2(x, y), Tile(int(target[y, x])))
 
     def find_tile(self, tile: Tile) -> Vector2:
-        position = np.where(self.map == tile.value)
+        positions = self._tile_positions.get(tile.value)
 
-        if np.size(position) == 0:
+        if not positions:
             return Vector2(-1)
 
-        return Vector2(int(position[1][0]), int(position[0][0]))
+        y, x = positions[0]
+        return Vector2(x, y)
 
     def is_empty(self) -> bool:
-        tiles_to_check = [Tile.SMALL_DOT, Tile.BIG_DOT, Tile.GHOST_NO_UPWARD_TURN_DOT]
-
-        for tile in tiles_to_check:
-            if self.find_tile(tile) != Vector2(-1):
-                return False
-
-        return True
+        return self.dot_count == 0
 
     def get_tile_coordinates(self, position: Vector2) -> Vector2:
         h, w = self.map.shape
@@ -1,16 +1,16 @@
 import pygame
 
-from main import load_image
+from pygame import SurfaceType
 
 
 class Tileset:
 
-    def __init__(self, path, size=(8, 8), margin=0, spacing=0):
+    def __init__(self, path, image: SurfaceType, size=(8, 8), margin=0, spacing=0):
         self.path = path
         self.size = size
         self.margin = margin
         self.spacing = spacing
-        self.image = load_image(path)
+        self.image = image
         self.rect = self.image.get_rect()
         self.tiles = []
         self.load()